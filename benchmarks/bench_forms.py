@@ -0,0 +1,75 @@
+"""forms and payloads shared by the benchmarks"""
+from casper import forms
+
+
+class LoginForm(forms.Form):
+    username = forms.CharField(max_length=10, style='greet')
+    email = forms.EmailField(label='user_email')
+    password = forms.PasswordField(must_contain_lower_case=True, must_contain_number=True, min_length=5)
+    remember_me = forms.BooleanField(required=False)
+    submit = forms.SubmitButtonField()
+
+    class Meta:
+        form_method = 'post'
+        form_url = '/login/'
+
+
+LOGIN_VALID = {'username': 'ada', 'email': 'ada@example.com', 'password': 'secret1', 'remember_me': 'yes'}
+LOGIN_INVALID = {'username': 'a' * 20, 'email': 'ada@', 'password': 'short', 'remember_me': 'maybe'}
+
+CHOICES = ['red', 'green', 'blue']
+
+# field type: (factory, valid value, invalid value)
+FIELD_CASES = {
+    'BooleanField': (lambda: forms.BooleanField(), 'yes', 'maybe'),
+    'CharField': (lambda: forms.CharField(max_length=10), 'ada', 'a' * 20),
+    'CheckBoxField': (lambda: forms.CheckBoxField(choices=CHOICES), 'red,blue', 'red,black'),
+    'ChoiceField': (lambda: forms.ChoiceField(choices=CHOICES), 'red', 'black'),
+    'ColorField': (lambda: forms.ColorField(), '#a0c0ff', '#zzz'),
+    'DataListField': (lambda: forms.DataListField(choices=CHOICES), 'green', 'black'),
+    'DateField': (lambda: forms.DateField(max_value='2030-01-01'), '2020-05-12', '2040-05-12'),
+    'DateTimeField': (lambda: forms.DateTimeField(), '2020-05-12 12:02:22', '2020-05-12'),
+    'DecimalField': (lambda: forms.DecimalField(max_value=100), '45.5', 'forty'),
+    'EmailField': (lambda: forms.EmailField(), 'ada@example.com', 'ada@'),
+    'FileField': (lambda: forms.FileField(), 'upload.txt', None),
+    'FloatField': (lambda: forms.FloatField(min_value=0), '3.5', 'three'),
+    'HiddenField': (lambda: forms.HiddenField(), 'token', None),
+    'ImageField': (lambda: forms.ImageField(), 'avatar.png', None),
+    'IntegerField': (lambda: forms.IntegerField(min_value=18), '42', '4x2'),
+    'PasswordField': (lambda: forms.PasswordField(must_contain_number=True), 'secret1', 'secret'),
+    'PhoneField': (lambda: forms.PhoneField(), '0456432234', 'call me'),
+    'RadioField': (lambda: forms.RadioField(choices=CHOICES), 'blue', 'black'),
+    'RangeField': (lambda: forms.RangeField(max_value=10), 5, 50),
+    'SlugField': (lambda: forms.SlugField(max_length=20), 'a slug', 'a' * 30),
+    'TextField': (lambda: forms.TextField(max_length=200), 'some text', 'a' * 300),
+    'TimeField': (lambda: forms.TimeField(), '12:00:03', '25:00'),
+    'UrlField': (lambda: forms.UrlField(), 'https://example.com/path', 'http://[::1'),
+    'UuidField': (lambda: forms.UuidField(), '12345678-1234-4234-8234-123456789012', 'not-a-uuid'),
+}
+
+
+def make_form(name:str, fields:dict, meta:dict=None):
+    attrs = dict(fields)
+    if meta:
+        attrs['Meta'] = type('Meta', (), meta)
+    return type(name, (forms.Form,), attrs)
+
+
+def make_single_field_form(field_type:str):
+    factory, valid, invalid = FIELD_CASES[field_type]
+    return make_form(field_type + 'Form', {'value': factory()}), valid, invalid
+
+
+def make_wide_form(field_count:int):
+    """a form of field_count char fields, with a payload for them"""
+    fields = {'field_{}'.format(i): forms.CharField(max_length=20, required=False) for i in range(field_count)}
+    data = {'field_{}'.format(i): 'value {}'.format(i) for i in range(field_count)}
+    return make_form('Wide{}Form'.format(field_count), fields), data
+
+
+def make_choice_form(choice_count:int):
+    choices = ['option_{}'.format(i) for i in range(choice_count)]
+    return make_form('Choice{}Form'.format(choice_count), {
+        'select': forms.ChoiceField(choices=choices),
+        'check': forms.CheckBoxField(choices=choices, required=False),
+    })
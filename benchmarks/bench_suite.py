@@ -0,0 +1,78 @@
+import pytest
+
+pytest.importorskip('pytest_benchmark')
+
+from bench_forms import (FIELD_CASES, LOGIN_INVALID, LOGIN_VALID, LoginForm, make_choice_form, make_form,
+                         make_single_field_form, make_wide_form)
+
+
+def test_login_form_construction(benchmark):
+    benchmark(LoginForm)
+
+
+def test_login_form_construction_with_data(benchmark):
+    benchmark(LoginForm, data=LOGIN_VALID)
+
+
+@pytest.mark.parametrize('payload', ['valid', 'invalid'])
+def test_login_form_is_valid(benchmark, payload):
+    data = LOGIN_VALID if payload == 'valid' else LOGIN_INVALID
+    result = benchmark(lambda: LoginForm(data=data).is_valid())
+    assert result is (payload == 'valid')
+
+
+@pytest.mark.parametrize('payload', ['valid', 'invalid'])
+@pytest.mark.parametrize('field_type', sorted(FIELD_CASES))
+def test_field_is_valid(benchmark, field_type, payload):
+    form_class, valid, invalid = make_single_field_form(field_type)
+    value = valid if payload == 'valid' else invalid
+    result = benchmark(lambda: form_class(data={'value': value}).is_valid())
+    assert result is (payload == 'valid')
+
+
+@pytest.mark.parametrize('field_count', [10, 100, 1000])
+def test_as_html_fields(benchmark, field_count):
+    form_class, data = make_wide_form(field_count)
+    form = form_class(initial=data)
+    benchmark(form.as_html)
+
+
+@pytest.mark.parametrize('field_count', [10, 100, 1000])
+def test_as_json_fields(benchmark, field_count):
+    form_class, data = make_wide_form(field_count)
+    form = form_class(initial=data)
+    benchmark(form.as_json)
+
+
+@pytest.mark.parametrize('choice_count', [10, 1000, 10000])
+def test_as_html_choices(benchmark, choice_count):
+    form = make_choice_form(choice_count)(initial={'select': 'option_1', 'check': 'option_2,option_3'})
+    benchmark(form.as_html)
+
+
+@pytest.mark.parametrize('choice_count', [10, 1000, 10000])
+def test_as_json_choices(benchmark, choice_count):
+    form = make_choice_form(choice_count)()
+    benchmark(form.as_json)
+
+
+@pytest.mark.parametrize('columns', [False, True], ids=['rows', 'columns'])
+def test_validate_many_throughput(benchmark, columns):
+    rows = [LOGIN_VALID if i % 4 else LOGIN_INVALID for i in range(1000)]
+    benchmark.extra_info['rows'] = len(rows)
+
+    def validate():
+        return sum(1 for clean_data, errors in LoginForm.validate_many(rows, columns=columns) if not errors)
+
+    assert benchmark(validate) == 750
+
+
+def test_validate_many_compiled_throughput(benchmark):
+    form_class = make_form('CompiledLoginForm', LoginForm.declared_fields, {'compiled': True})
+    rows = [LOGIN_VALID if i % 4 else LOGIN_INVALID for i in range(1000)]
+    benchmark.extra_info['rows'] = len(rows)
+
+    def validate():
+        return sum(1 for clean_data, errors in form_class.validate_many(rows) if not errors)
+
+    assert benchmark(validate) == 750
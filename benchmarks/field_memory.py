@@ -0,0 +1,46 @@
+"""bytes allocated per field definition and per bound field, measured with tracemalloc.
+
+Run from the repository root: python benchmarks/field_memory.py"""
+import gc
+import os
+import sys
+import tracemalloc
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from casper import forms, BoundField
+
+
+FIELDS = [
+    ('CharField', lambda: forms.CharField(max_length=10)),
+    ('IntegerField', lambda: forms.IntegerField(min_value=1)),
+    ('EmailField', lambda: forms.EmailField()),
+    ('DateField', lambda: forms.DateField()),
+    ('PasswordField', lambda: forms.PasswordField()),
+    ('TextField', lambda: forms.TextField()),
+    ('ChoiceField', lambda: forms.ChoiceField(choices=['a', 'b', 'c'])),
+    ('SubmitButtonField', lambda: forms.SubmitButtonField()),
+]
+
+
+def measure(factory, count:int=2000) -> float:
+    gc.collect()
+    tracemalloc.start()
+    start = tracemalloc.get_traced_memory()[0]
+    objects = [factory() for _ in range(count)]
+    allocated = tracemalloc.get_traced_memory()[0] - start
+    tracemalloc.stop()
+    del objects
+    return allocated / count
+
+
+def main() -> None:
+    field = forms.CharField()
+    print('{:<20} {:>10}'.format('field', 'bytes'))
+    for name, factory in FIELDS:
+        print('{:<20} {:>10.0f}'.format(name, measure(factory)))
+    print('{:<20} {:>10.0f}'.format('BoundField', measure(lambda: BoundField(field))))
+
+
+if __name__ == '__main__':
+    main()
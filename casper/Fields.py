@@ -1,19 +1,115 @@
+import asyncio
 import re
+from datetime import date, datetime, time
+from decimal import Decimal
+from email.utils import parseaddr
+from inspect import isawaitable, iscoroutinefunction
+from time import perf_counter
+from urllib.parse import urlparse
 
 from dateutil.parser import parse
 
 from casper.exceptions.exceptions import FieldCreateFailedException, ValidationFailedException
+from casper.html_template import HtmlTemplate, ATTRIBUTE_TEMPLATE
+from casper.lru_cache import LruCache
 from casper.widgets.widgets import Widgets, Validator
 
 
+compiled_patterns = {}
+
+
+def get_pattern(pattern:str):
+    """returns the compiled pattern, each distinct pattern is compiled once per process"""
+    compiled = compiled_patterns.get(pattern)
+    if compiled is None:
+        try:
+            compiled = re.compile(pattern)
+        except (re.error, TypeError) as e:
+            raise FieldCreateFailedException("""Invalid regex {}: {}""".format(pattern, e))
+        compiled_patterns[pattern] = compiled
+    return compiled
+
+
+COLOR_PATTERN = get_pattern(r'^#(?:[0-9a-fA-F]{3}){1,2}$')
+EMAIL_PATTERN = get_pattern(r"^[a-zA-Z0-9_.+-]+@[a-zA-Z0-9-]+\.[a-zA-Z0-9-.]+$")
+UUID_PATTERN = get_pattern(r'[a-f0-9]{8}-[a-f0-9]{4}-4[a-f0-9]{3}-[89ab][a-f0-9]{3}-[a-f0-9]{12}')
+PHONE_PATTERN = get_pattern(
+    r'^\s*(?:\+?(\d{1,3}))?([-. (]*(\d{3})[-. )]*)?((\d{3})[-. ]*(\d{2,4})(?:[-.x ]*(\d+))?)\s*$')
+# strptime directives that set the date, a format without any of them only parses a time
+DATE_DIRECTIVE_PATTERN = get_pattern(r'%[YyGmdjbBUWVxc]')
+TIME_PATTERN = get_pattern(
+    r"^((([0]?[1-9]|1[0-2])(:|\.)[0-5][0-9]((:|\.)[0-5][0-9])?( )?(AM|am|aM|Am|PM|pm|pM|Pm))|(([0]?[0-9]|1[0-9]|2[0-3])(:|\.)[0-5][0-9]((:|\.)[0-5][0-9])?))$")
+
+BOOLEAN_OPTIONS = {
+    'true':True,
+    'false': False,
+    True: True,
+    False: False,
+    'ok': True,
+    'yes': True,
+    'no': False
+}
+
+
+class Invalid:
+    """a failed check, passed back through the validation pipeline instead of raised"""
+    __slots__ = ('message',)
+
+    def __init__(self, message:str):
+        self.message = message
+
+    def __str__(self):
+        return self.message
+
+
+def copy_json_value(value):
+    if isinstance(value, list):
+        return [copy_json_value(val) for val in value]
+    if isinstance(value, dict):
+        return {key: copy_json_value(val) for key, val in value.items()}
+    return value
+
+
+# per request state, kept on the definition for standalone use and on a BoundField per form
+FIELD_STATE_SLOTS = ('_data', '_default', '_error', '_clean_data')
+# written by validation or derived from the definition, so writing them keeps the version,
+# _default stays versioned as the compiled validator and the json schema read it
+UNVERSIONED_SLOTS = frozenset(('_version', '_data', '_error', '_clean_data', '_static_json', '_form_validator',
+                               '_form_defaults'))
+
+
 class BaseField:
+    __slots__ = ('style', 'label', 'name', '_version', '_static_json')
     _is_valid = False
-    __validated = False
-    style = None
-    label = None
-    name = None
-
-    def as_json(self) -> dict:
+    _field_type = 'BaseField'
+    # keys of as_json a subclass builds again on each call instead of copying the cached value
+    _fresh_json_keys = ()
+    _html_template = HtmlTemplate("""<div class=''>{help_text} {label} {html} <br> {error}</div>""")
+    _p_template = HtmlTemplate("""<p class=''>{help_text} {label} {html} {error}</p>""")
+    _table_template = HtmlTemplate("""<div class=''><span>{help_text} {label} {html} {error}</span></div>""")
+    _u_template = HtmlTemplate("""<li class=''><span>{help_text} {label} {html} {error}</span></li>""")
+
+    def __init__(self):
+        object.__setattr__(self, '_version', 0)
+        object.__setattr__(self, 'style', None)
+        object.__setattr__(self, 'label', None)
+        object.__setattr__(self, 'name', None)
+        object.__setattr__(self, '_static_json', None)
+
+    def __init_subclass__(cls, **kwargs):
+        super().__init_subclass__(**kwargs)
+        cls._field_type = ''.join([i for i in cls.__name__ if i.isalpha()])
+
+    def __setattr__(self, key, value):
+        # any change to the definition gets a new version, render caches are keyed on it
+        object.__setattr__(self, key, value)
+        if key not in UNVERSIONED_SLOTS:
+            object.__setattr__(self, '_version', getattr(self, '_version', 0) + 1)
+
+    def _is_pristine(self) -> bool:
+        return True
+
+    def as_json(self, bound=None) -> dict:
         return {
             'field_type': self._get_field_type(self),
             'field_name': self.name,
@@ -21,31 +117,46 @@ class BaseField:
             'style' : self.style
         }
 
-    def as_html(self) -> str:
-        html = """<div class=''>field_help_text field_label field_html <br> field_error</div>""".format(self.style)
-        return self.__html_output(html=html)
+    def _get_json_version(self) -> int:
+        return self._version
 
-    def as_p(self) -> str:
-        html = """<p class=''>field_help_text field_label field_html field_error</p>""".format(self.style)
-        return self.__html_output(html=html)
+    def _get_static_json_entry(self, version:int) -> tuple:
+        static_json = self._static_json
+        if static_json is None or static_json[0] != version:
+            field_json = self.as_json()
+            containers = tuple(key for key, value in field_json.items()
+                               if isinstance(value, (list, dict)) and key not in self._fresh_json_keys)
+            static_json = (version, field_json, containers)
+            self._static_json = static_json
+        return static_json
 
-    def as_table(self) -> str:
-        html = """<div class=''><span>field_help_text field_label field_html field_error</span></div>""".format(self.style)
-        return self.__html_output(html=html)
+    def _copy_static_json(self) -> dict:
+        """a copy of the static json for a caller to keep, the lists and dicts in it are copied too"""
+        version, field_json, containers = self._get_static_json_entry(self._get_json_version())
+        field_json = dict(field_json)
+        for key in containers:
+            field_json[key] = copy_json_value(field_json[key])
+        return field_json
 
-    def as_u(self) -> str:
-        html = """<li class=''><span>field_help_text field_label field_html field_error</span></li>""".format(self.style)
-        return self.__html_output(html=html)
-
-    def __html_output(self, html) -> str:
-        fields = self._get_html_fields()
-        return html.replace('field_help_text', fields['help_text']) \
-            .replace('field_label', fields['label']) \
-            .replace('field_html', fields['html']) \
-            .replace('field_error', fields['error'])\
-            .replace('None', '')
-
-    def _get_html_fields(self):
+    def _get_json(self, bound=None) -> dict:
+        return self._copy_static_json()
+
+    def as_html(self, bound=None) -> str:
+        return self._html_template.render(**self._get_html_fields(bound))
+
+    def as_p(self, bound=None) -> str:
+        return self._p_template.render(**self._get_html_fields(bound))
+
+    def as_table(self, bound=None) -> str:
+        return self._table_template.render(**self._get_html_fields(bound))
+
+    def as_u(self, bound=None) -> str:
+        return self._u_template.render(**self._get_html_fields(bound))
+
+    def render_html(self, parts:list, bound=None) -> None:
+        self._html_template.render_into(parts, **self._get_html_fields(bound))
+
+    def _get_html_fields(self, bound=None):
         raise NotImplementedError
 
     def _set_field_name(self, name:str=None) -> None:
@@ -55,24 +166,27 @@ class BaseField:
 
     @staticmethod
     def _get_field_type(field) -> str:
-        return ''.join([i for i in (str(type(field)).split('.'))[-1] if i.isalpha()])
+        return field._field_type
 
 
 class BaseButtonField(BaseField):
+    __slots__ = ('field_type',)
     button_type = None
+    _button_template = HtmlTemplate("""<input class='{}' type='{}' name='{}' id='id_{}' />""")
     def __init__(self, *,label:str=None,style:str = None, **kwargs):
+        super().__init__()
+        self.field_type = None
         self.label = label
         self.style = style
-        super().__init__()
 
-    def as_json(self) -> dict:
-        return {**super().as_json(),**{
+    def as_json(self, bound=None) -> dict:
+        return {**super().as_json(bound),**{
             'button_type': self.button_type
         }}
 
-    def _get_html_fields(self) -> dict:
+    def _get_html_fields(self, bound=None) -> dict:
         return {
-            'html' : """<input class='{}' type='{}' name='{}' id='id_{}' />""".format(self.style, self.button_type, self.name, self.name),
+            'html' : self._button_template.render(self.style, self.button_type, self.name, self.name),
             'error': '',
             'help_text':'',
             'label': ''
@@ -80,29 +194,26 @@ class BaseButtonField(BaseField):
 
 
 class Fields(BaseField):
-    _data = None
-    _default = None
-    _required = False
-    _allow_blank = True
-    _allow_null = True
-    _read_only = False
-    _disabled = False
-    _regex = None
-    _place_holder = None
-    help_text = None
-    _custom_error = None
-    _error = None
-    _clean_data = None
-    _widget = None
-    _auto_focus = False
-    _auto_complete = False
-    _validators = None
+    __slots__ = FIELD_STATE_SLOTS + (
+        '_required', '_allow_blank', '_allow_null', '_read_only', '_disabled', '_regex', '_place_holder',
+        'help_text', '_custom_error', '_widget', '_auto_focus', '_auto_complete', '_validators',
+        '_form_validator', '_full_match', '_result_cache_size', '_form_defaults')
+    _label_template = HtmlTemplate("""<span><label class='{}' for='{}'>{}</label></span><br>""")
+    _error_template = HtmlTemplate("""<span class='form_field_error'>{}<br></span""")
+    _help_text_template = HtmlTemplate("""<span class='form_help_text'>{}<br></span""")
 
     def __init__(self, data=None, default=None, required: bool=True, allow_null: bool=True,
                  allow_blank: bool=True, read_only: bool=False, label:str=None, regex:str=None,
                  place_holder:str=None, custom_error:str=None, help_text:str=None,
                  widget: Widgets=None,auto_focus:bool=False, auto_complete:bool = False,
-                 validators:list = None, style:str=None, disabled:bool=False, **kwargs):
+                 validators:list = None, style:str=None, disabled:bool=False, full_match:bool=False,
+                 result_cache_size:int=None, **kwargs):
+        super().__init__()
+        self._form_defaults = None
+        self._data = None
+        self._error = None
+        self._clean_data = None
+        self._form_validator = None
         self._required = required
         self._default = default
         self._allow_blank = allow_blank
@@ -111,6 +222,10 @@ class Fields(BaseField):
         self._disabled = disabled
         self.label = label
         self._regex = regex
+        if regex:
+            # an invalid regex fails when the field is created, not on its first validation
+            get_pattern(regex)
+        self._full_match = full_match
         self._place_holder = place_holder
         self._widget = widget
         self._custom_error = custom_error
@@ -118,76 +233,188 @@ class Fields(BaseField):
         self._auto_focus = auto_focus
         self.help_text = help_text
         self._validators = validators
+        self._result_cache_size = result_cache_size
         self.__validate_created_field()
         self.style = style
-        super().__init__()
         if data is not None:
             self._set_data(data)
 
 
 
-
-
-
-    # def __setattr__(self, key, value):
-    #     print(value)
-
-
     def __validate_created_field(self) -> None:
         if self._required and self._default:
             raise FieldCreateFailedException('Cannot set required to True when a default is provided')
 
-    def _get_field_data(self):
-        if not self._data:
-            return self._default
-        return self._data
+    def _get_field_data(self, bound=None):
+        if bound is None:
+            bound = self
+        if not bound._data:
+            return bound._default
+        return bound._data
+
+    def _compile_validator(self, cache_results:bool=True) -> 'FormValidator':
+        self._form_validator = FormValidator(self, cache_results=cache_results)
+        return self._form_validator
+
+    def _get_form_validator(self) -> 'FormValidator':
+        """the FormValidator of the current definition, rebuilt after any change to it"""
+        form_validator = self._form_validator
+        if form_validator is None:
+            return self._compile_validator()
+        if form_validator.version != self._version:
+            return self._compile_validator(cache_results=form_validator.cache_results)
+        return form_validator
+
+    def validation_cache_info(self) -> dict:
+        """hits, misses and size of the result cache, None when the field has none"""
+        result_cache = self._form_validator.result_cache if self._form_validator else None
+        if result_cache is None:
+            return None
+        return {'hits': result_cache.hits, 'misses': result_cache.misses, 'size': len(result_cache),
+                'max_size': result_cache.max_size}
 
     def _set_data(self, data) -> None:
         self._data = data
-        self.validate()
+        self._error = None
+        self._clean_data = None
 
     def _set_default(self, default) -> None:
         self._default = default
 
-    def _set_error(self, error:str) -> None:
+    def _set_error(self, error:str, bound=None) -> None:
+        if bound is None:
+            bound = self
         if self._custom_error:
-            self._error = error
+            bound._error = error
         else:
-            self._error = error
-
-    def validate(self, data=None):
+            bound._error = error
+
+    def validate(self, data=None, bound=None):
+        result = self._check(data, bound)
+        if result.__class__ is Invalid:
+            raise ValidationFailedException(result.message)
+        return result
+
+    def _check(self, data=None, bound=None):
+        """validate without raising, a failed check is returned as an Invalid"""
+        if bound is None:
+            bound = self
         if data is None:
-            data = self._get_field_data()
+            data = self._get_field_data(bound)
 
         #general validation
-        form_validator = FormValidator(self)
+        form_validator = self._get_form_validator()
+        data = form_validator.check(data)
+
+        # user defined validators
+        if self._validators and data.__class__ is not Invalid:
+            data = self.__run_validators(data)
+
+        if data.__class__ is Invalid:
+            self._set_error(data.message, bound)
+            return data
+        bound._clean_data = data
+        return data
+
+    def _check_timed(self, bound, timings:dict):
+        """_check, recording the seconds spent in each step into timings"""
+        data = self._get_field_data(bound)
+        form_validator = self._get_form_validator()
+
+        start = perf_counter()
+        result = form_validator.check_general(data)
+        end = perf_counter()
+        timings['general'] = end - start
+        if result is None:
+            result = data
+            if data is not None:
+                result = form_validator.check_type(data)
+                start, end = end, perf_counter()
+                timings['checker'] = end - start
+
+        if self._validators and result.__class__ is not Invalid:
+            result = self.__run_validators(result)
+            timings['validators'] = perf_counter() - end
+
+        if result.__class__ is Invalid:
+            self._set_error(result.message, bound)
+            return result
+        bound._clean_data = result
+        return result
+
+    def __run_validators(self, data):
+        # user validators reject a value by raising, it is caught here and nowhere else
         try:
-            data = form_validator.run(data=data)
-        except ValidationFailedException as e:
-            error = str(e)
-            self._set_error(error)
-            raise ValidationFailedException(error)
+            for validator in self._validators:
+                if isinstance(validator, Validator):
+                    if iscoroutinefunction(validator.run):
+                        return Invalid('Async validators need ais_valid')
+                    data = validator.run(data=data)
+        except Exception as e:
+            return Invalid(str(e))
+        return data
 
+    def precheck(self, data=None, bound=None) -> None:
+        """runs only the cheap general and length checks of validate"""
+        error = self._precheck(data, bound)
+        if error is not None:
+            raise ValidationFailedException(error.message)
 
-        # user defined validators
-        if self._validators:
+    def _precheck(self, data=None, bound=None):
+        if bound is None:
+            bound = self
+        if data is None:
+            data = self._get_field_data(bound)
+
+        form_validator = self._get_form_validator()
+        error = form_validator.precheck(data)
+        if error is not None:
+            self._set_error(error.message, bound)
+        return error
+
+    async def avalidate(self, data=None, bound=None, timeout:float=None):
+        """validate, awaiting async validators each within timeout seconds"""
+        result = await self._acheck(data, bound, timeout)
+        if result.__class__ is Invalid:
+            raise ValidationFailedException(result.message)
+        return result
+
+    async def _acheck(self, data=None, bound=None, timeout:float=None):
+        if bound is None:
+            bound = self
+        if data is None:
+            data = self._get_field_data(bound)
+
+        #general validation
+        form_validator = self._get_form_validator()
+        data = form_validator.check(data)
+
+        # user defined validators, run in order as each one gets the previous one's data
+        if self._validators and data.__class__ is not Invalid:
             try:
                 for validator in self._validators:
                     if isinstance(validator, Validator):
                         data = validator.run(data=data)
+                        if isawaitable(data):
+                            data = await asyncio.wait_for(data, timeout)
+            except asyncio.TimeoutError:
+                data = Invalid('Validation timed out')
             except Exception as e:
-                error = str(e)
-                self._set_error(error)
-                raise ValidationFailedException(error)
+                data = Invalid(str(e))
 
-        self._clean_data = data
-        return self._clean_data
+        if data.__class__ is Invalid:
+            self._set_error(data.message, bound)
+            return data
+        bound._clean_data = data
+        return data
 
-    def as_json(self) -> dict:
-        return {**super().as_json(),**{
+    def as_json(self, bound=None) -> dict:
+        if bound is None:
+            bound = self
+        return {**super().as_json(bound),**{
             'required': self._required,
-            'default': self._default,
-            'data': self._data,
+            'default': bound._default,
+            'data': bound._data,
             'allow_blank':self._allow_blank,
             'allow_null': self._allow_null,
             'read_only': self._read_only,
@@ -197,9 +424,22 @@ class Fields(BaseField):
             'custom_error':self._custom_error,
             'auto_focus': self._auto_focus,
             'auto_complete':self._auto_complete,
+            'error': bound._error,
         }}
 
-    def _get_base_html_fields(self) -> dict:
+    def _get_json(self, bound=None) -> dict:
+        """the static json of the definition with the per request values spliced in"""
+        if bound is None:
+            bound = self
+        field_json = self._copy_static_json()
+        field_json['default'] = bound._default
+        field_json['data'] = bound._data
+        field_json['error'] = bound._error
+        return field_json
+
+    def _get_base_html_fields(self, bound=None) -> dict:
+        if bound is None:
+            bound = self
         label=None
         if self.label:
             label = self.label.title()
@@ -207,95 +447,287 @@ class Fields(BaseField):
             'html': '',
             'error': '',
             'help_text': '',
-            'label': """<span><label class='{}' for='{}'>{}</label></span><br>""".format(self.style, self.name,
-                                                                                         label)
+            'label': self._label_template.render(self.style, self.name, label)
         }
-        if self._error:
-            res['error'] = """<span class='form_field_error'>{}<br></span""".format(self._error)
+        if bound._error:
+            res['error'] = self._error_template.render(bound._error)
         if self.help_text:
-            res['help_text'] = """<span class='form_help_text'>{}<br></span""".format(self.help_text)
+            res['help_text'] = self._help_text_template.render(self.help_text)
 
         return res
 
-    def _get_html_fields(self) -> dict:
-        return self._get_base_html_fields()
+    def _get_html_fields(self, bound=None) -> dict:
+        return self._get_base_html_fields(bound)
+
+    def _get_field_form_defaults(self, bound=None) -> str:
+        """the attributes of the input, only value is rendered per call"""
+        form_defaults = self._form_defaults
+        if form_defaults is None or form_defaults[0] != self._version:
+            form_defaults = (self._version,) + self.__build_form_defaults()
+            self._form_defaults = form_defaults
+
+        version, before_value, after_value, has_value = form_defaults
+        if has_value:
+            field_data = self._get_field_data(bound)
+            if field_data:
+                return before_value + ATTRIBUTE_TEMPLATE.render('value', field_data) + after_value
+        return before_value + after_value
+
+    def __build_form_defaults(self) -> tuple:
+        """the attributes before and after value, and whether the input has a value"""
+        before_value = []
+        if self._regex:
+            before_value.append(ATTRIBUTE_TEMPLATE.render('pattern', self._regex))
 
-    def _get_field_form_defaults(self) -> str:
-        defaults = ''
         if self._place_holder:
-            defaults += """pattern='{}' """.format(self._regex)
-
-        if self._regex:
-            defaults += """placeholder='{}' """.format(self._place_holder)
+            before_value.append(ATTRIBUTE_TEMPLATE.render('placeholder', self._place_holder))
 
         if self.name:
-            defaults += """id='id_{}' """.format(self.name)
+            before_value.append(ATTRIBUTE_TEMPLATE.render('id', 'id_' + self.name))
 
         field_type = self._get_field_type(self)
+        has_value = field_type not in ('CheckBoxField', 'ChoiceField', 'RadioField', 'DataListField')
 
-        if not field_type in ['CheckBoxField','ChoiceField', 'RadioField', 'DataListField']:
-            if self._get_field_data():
-                defaults += """value='{}' """.format(self._get_field_data())
-
-            if self._auto_complete:
-                defaults += """autocomplete='on' """
+        after_value = []
+        if has_value and self._auto_complete:
+            after_value.append("""autocomplete='on' """)
 
-        if not field_type in ['CheckBoxField','ChoiceField']:
-            if self._required:
-                defaults += """required='true' """
+        if field_type not in ('CheckBoxField', 'ChoiceField') and self._required:
+            after_value.append("""required='true' """)
 
-        if not field_type in ['CheckBoxField', 'RadioField']:
-            if self.name:
-                defaults += """name='{}' """.format(self.name)
+        if field_type not in ('CheckBoxField', 'RadioField') and self.name:
+            after_value.append(ATTRIBUTE_TEMPLATE.render('name', self.name))
 
         if self._auto_focus:
-            defaults += """autofocus='true' """
+            after_value.append("""autofocus='true' """)
 
         if self._read_only:
-            defaults += """readonly='true' """
+            after_value.append("""readonly='true' """)
 
         if self._disabled:
-            defaults += """disabled='true' """
+            after_value.append("""disabled='true' """)
 
-        return defaults
+        return ''.join(before_value), ''.join(after_value), has_value
 
 
-class FormValidator(Validator):
-
-    field = None
-    data = None
+class BoundField:
+    """per-request state of a declared field, the field itself is never mutated"""
+    __slots__ = ('field',) + FIELD_STATE_SLOTS
 
     def __init__(self, field:Fields):
         self.field = field
+        self._data = field._data
+        self._default = field._default
+        self._error = None
+        self._clean_data = None
+
+    def __getattr__(self, item):
+        if item == 'field':
+            raise AttributeError(item)
+        return getattr(self.field, item)
+
+    def _get_field_data(self):
+        return self.field._get_field_data(self)
+
+    def _set_data(self, data) -> None:
+        self._data = data
+        self._error = None
+        self._clean_data = None
+
+    def _set_default(self, default) -> None:
+        self._default = default
+
+    def _set_error(self, error:str) -> None:
+        self.field._set_error(error, self)
+
+    def _is_pristine(self) -> bool:
+        return self._data is self.field._data and self._default is self.field._default and self._error is None
+
+    def _reset(self, data=None) -> None:
+        self._data = data
+        self._default = self.field._default
+        self._error = None
+        self._clean_data = None
+
+    def validate(self, data=None):
+        return self.field.validate(data, self)
+
+    def precheck(self, data=None) -> None:
+        return self.field.precheck(data, self)
+
+    async def avalidate(self, data=None, timeout:float=None):
+        return await self.field.avalidate(data, self, timeout)
+
+    def as_json(self) -> dict:
+        return self.field.as_json(self)
+
+    def _get_json(self) -> dict:
+        return self.field._get_json(self)
 
+    def as_html(self) -> str:
+        return self.field.as_html(self)
+
+    def as_p(self) -> str:
+        return self.field.as_p(self)
+
+    def as_table(self) -> str:
+        return self.field.as_table(self)
+
+    def as_u(self) -> str:
+        return self.field.as_u(self)
+
+    def render_html(self, parts:list) -> None:
+        self.field.render_html(parts, self)
+
+
+class FormValidator(Validator):
+
+    field = None
+    checker = None
+    regex_match = None
+    max_length = None
+    min_length = None
+    max_value = None
+    min_value = None
+    length_first = False
+    cost = 1
+    version = None
+    cache_results = True
+    result_cache = None
+    today_keyed = False
+
+    # rough relative cost of each type checker, used to order cost ordered validation
+    checker_costs = {
+        'DateField': 4, 'DateTimeField': 4, 'TimeField': 4,
+        'EmailField': 3, 'PhoneField': 3, 'UrlField': 3, 'UuidField': 2, 'ColorField': 2,
+        'PasswordField': 2, 'SlugField': 2, 'DecimalField': 2,
+    }
+    # checkers whose first check is the length, their length checks are cheap prechecks
+    length_first_checkers = ('CharField', 'TextField', 'SlugField')
+    # checkers whose result depends only on the value, so it can be cached
+    pure_checkers = ('DateField', 'DateTimeField', 'TimeField', 'EmailField', 'UrlField', 'PhoneField', 'UuidField')
+    # a time without a date is parsed as today, their cached results are only good for the day
+    today_keyed_checkers = ('DateField', 'DateTimeField', 'TimeField')
+
+    def __init__(self, field:Fields, cache_results:bool=True):
+        self.field = field
+        self.version = field._version
+        self.cache_results = cache_results
+        field_type = field._get_field_type(field)
+
+        checker = getattr(self, field_type, None)
+        if callable(checker):
+            self.checker = checker
+        self.cost = self.checker_costs.get(field_type, 1)
+
+        if field._regex:
+            pattern = get_pattern(field._regex)
+            self.regex_match = pattern.fullmatch if field._full_match else pattern.match
+            self.cost += 2
+        else:
+            self.length_first = field_type in self.length_first_checkers
+        if field._validators:
+            self.cost += 2 * len(field._validators)
+        elif cache_results and field._result_cache_size and field_type in self.pure_checkers:
+            self.result_cache = LruCache(field._result_cache_size)
+            self.today_keyed = field_type in self.today_keyed_checkers
+
+        self.max_length = getattr(field, '_max_length', None)
+        self.min_length = getattr(field, '_min_length', None)
+        self.max_value = getattr(field, '_max_value', None)
+        self.min_value = getattr(field, '_min_value', None)
+        self.formats = getattr(field, '_formats', ())
+
+        # date bounds are parsed once per version of the field
+        parse_bound = getattr(field, '_parse_bound', None)
+        if parse_bound is not None:
+            self.max_value = parse_bound(self.max_value)
+            self.min_value = parse_bound(self.min_value)
 
     def run(self, data):
-        field = self.field
-        self.data = data
+        return self._raise_invalid(self.check(data))
 
-        if field._required and not data:
-            raise ValidationFailedException('This field is required')
-        if not field._allow_null and data is None:
-            raise ValidationFailedException('This field cannot be null')
-        if not field._allow_blank and not data:
-            raise ValidationFailedException('This field cannot be blank')
+    @staticmethod
+    def _raise_invalid(result):
+        # the public helpers raise, the checkers pass an Invalid back instead
+        if result.__class__ is Invalid:
+            raise ValidationFailedException(result.message)
+        return result
+
+    def check(self, data):
+        """run without raising, a failed check is returned as an Invalid"""
+        error = self.check_general(data)
+        if error is not None:
+            return error
 
         if data is None:
             return data
-
+        return self.check_type(data)
+
+    def check_type(self, data):
+        """the regex and type checker part of check, for data that passed the general checks"""
+        result_cache = self.result_cache
+        if result_cache is None or data.__class__ is not str:
+            return self.__check_type(data)
+
+        key = (date.today(), data) if self.today_keyed else data
+        result = result_cache.get(key)
+        if result is None:
+            result = self.__check_type(data)
+            result_cache.set(key, result)
+        return result
+
+    def __check_type(self, data):
         try:
-            if field._regex:
-                if not re.match(field._regex, data):
-                    raise ValidationFailedException("""Value does not match the pattern {}""".format(field._regex))
-
-            field_type = field._get_field_type(field)
-            if hasattr(self, field_type) and callable(getattr(self, field_type)):
-                func = getattr(self, field_type)
-                return func(data)
+            if self.regex_match is not None:
+                if not self.regex_match(data):
+                    return Invalid("""Value does not match the pattern {}""".format(self.field._regex))
+
+            if self.checker is not None:
+                return self.checker(data)
         except Exception as e:
-            raise ValidationFailedException(str(e))
+            return Invalid(str(e))
         return data
 
+    def check_general(self, data):
+        field = self.field
+        if field._required and not data:
+            return Invalid('This field is required')
+        if not field._allow_null and data is None:
+            return Invalid('This field cannot be null')
+        if not field._allow_blank and not data:
+            return Invalid('This field cannot be blank')
+        return None
+
+    def precheck(self, data):
+        """the cheap checks of check, failing with the same message check would"""
+        error = self.check_general(data)
+        if error is not None or data is None or not self.length_first:
+            return error
+        try:
+            return self._check_length(data)
+        except Exception as e:
+            return Invalid(str(e))
+
+    def _check_length(self, data):
+        if self.max_length is not None and len(data) > self.max_length:
+            return Invalid("""Length cannot be more than {}""".format(self.max_length))
+        if self.min_length is not None and len(data) < self.min_length:
+            return Invalid("""Length cannot be less than {}""".format(self.min_length))
+        return None
+
+    def _check_range(self, data, field='Value'):
+        if self.max_value is not None and data > self.max_value:
+            return Invalid("""{} cannot be more than {}""".format(field, self.max_value))
+        if self.min_value is not None and data < self.min_value:
+            return Invalid("""{} cannot be less than {}""".format(field, self.min_value))
+        return None
+
+    def _check_choices(self, data) -> str:
+        remote_choices = getattr(self.field, '_remote_choices', None)
+        if remote_choices is None:
+            return self._validate_choice_field(data=data, choices=self.field._get_choice_table().index)
+        return self._validate_choice_field(data=data, choices=remote_choices.contains(data))
 
     @staticmethod
     def check_max_length(data, max_length) -> None:
@@ -319,12 +751,19 @@ class FormValidator(Validator):
 
     @staticmethod
     def validate_choice_field(data, choices) -> str:
-        choice_keys = []
-        for val in choices:
-            choice_keys.append(list(val.values())[0])
+        """raises ValidationFailedException for a value not in choices, a list of {label: value} dicts"""
+        values = [list(val.values())[0] for val in choices]
+        return FormValidator._raise_invalid(FormValidator._validate_choice_field(data, values))
+
+    @staticmethod
+    def _validate_choice_field(data, choices) -> str:
         for val in data:
-            if not val in choice_keys:
-                raise ValidationFailedException("""{} is not a valid option for this field""".format(val))
+            try:
+                is_option = val in choices
+            except TypeError:
+                is_option = False
+            if not is_option:
+                return Invalid("""{} is not a valid option for this field""".format(val))
         return str(data)
 
     @staticmethod
@@ -339,196 +778,186 @@ class FormValidator(Validator):
         return text
 
     @staticmethod
-    def parse_to_time(data):
+    def parse_to_time(data, formats:tuple=()):
+        """returns the parsed datetime, raises ValidationFailedException when nothing can parse data"""
+        return FormValidator._raise_invalid(FormValidator._parse_to_time(data, formats))
+
+    @staticmethod
+    def _parse_to_time(data, formats:tuple=()):
+        """returns the parsed datetime, or an Invalid when nothing can parse data"""
+        if isinstance(data, datetime):
+            return data
+        data = str(data)
+
+        # the C level parsers are tried first, dateutil only handles what they cannot
+        for time_format in formats:
+            try:
+                parsed = datetime.strptime(data, time_format)
+            except ValueError:
+                continue
+            if DATE_DIRECTIVE_PATTERN.search(time_format) is None:
+                # strptime dates a bare time 1900-01-01, the other parsers date it today
+                return datetime.combine(date.today(), parsed.time())
+            return parsed
         try:
-            return parse(str(data))
+            return datetime.fromisoformat(data)
+        except ValueError:
+            pass
+        if ':' in data:
+            try:
+                return datetime.combine(date.today(), time.fromisoformat(data))
+            except ValueError:
+                pass
+
+        try:
+            return parse(data)
         except Exception:
-            raise ValidationFailedException('Invalid datetime object')
+            return Invalid('Invalid datetime object')
 
     def CharField(self, data) -> str:
-        if getattr(self.field, '_max_length', None) is not None:
-            self.check_max_length(data=data, max_length=getattr(self.field, '_max_length'))
-
-        if getattr(self.field, '_min_length', None) is not None:
-            self.check_min_length(data=data, min_length=getattr(self.field, '_min_length'))
+        error = self._check_length(data)
+        if error is not None:
+            return error
         return str(data)
 
     @staticmethod
     def ColorField(data) -> str:
-        if not re.match(r'^#(?:[0-9a-fA-F]{3}){1,2}$', data):
-            raise ValidationFailedException("Invalid hex color")
+        if not COLOR_PATTERN.match(data):
+            return Invalid("Invalid hex color")
         return str(data)
 
     @staticmethod
     def BooleanField(data) -> bool:
+        if type(data) == str:
+            data = data.lower()
         try:
-            if type(data) == str:
-                data = data.lower()
-
-            if not data in ['true', 'false', True, False, 'ok', 'yes', 'no']:
-                raise Exception
-            bool_options = {
-                'true':True,
-                'false': False,
-                True: True,
-                False: False,
-                'ok': True,
-                'yes': True,
-                'no': False
-            }
-
-            return bool_options[data]
-
-        except Exception:
-            raise ValidationFailedException('Invalid Boolean')
+            return BOOLEAN_OPTIONS[data]
+        except (KeyError, TypeError):
+            return Invalid('Invalid Boolean')
 
     def CheckBoxField(self, data) -> str:
-        return self.validate_choice_field(data=data, choices=getattr(self.field, '_choices'))
+        return self._check_choices(data=data)
 
     def ChoiceField(self, data) -> str:
-        return self.validate_choice_field(data=data, choices=getattr(self.field, '_choices'))
+        return self._check_choices(data=data)
 
     def DataListField(self, data) -> str:
-        return self.validate_choice_field(data=data, choices=getattr(self.field, '_choices'))
+        return self._check_choices(data=data)
 
     def DateField(self, data):
-        data = self.parse_to_time(data=data)
-        if getattr(self.field, '_max_vale', None) is not None:
-            self.check_max_value(data=data, max_value=self.parse_to_time(getattr(self.field, '_max_vale')),field='Date value')
-
-        if getattr(self.field, '_min_vale', None) is not None:
-            self.check_min_value(data=data, min_value=self.parse_to_time(getattr(self.field, '_min_vale')),field='Date value')
+        data = self._parse_to_time(data=data, formats=self.formats)
+        if data.__class__ is Invalid:
+            return data
+        error = self._check_range(data, field='Date value')
+        if error is not None:
+            return error
 
         if data.hour > 0:
-            raise ValidationFailedException('Value is not a valid date')
+            return Invalid('Value is not a valid date')
         return data
 
     def DateTimeField(self, data):
         if not ':' in str(data):
-            raise ValidationFailedException('Value is not a valid datetime')
-
-        data = self.parse_to_time(data=data)
-        if getattr(self.field, '_max_value', None) is not None:
-            self.check_max_value(data=data, max_value=self.parse_to_time(getattr(self.field, '_max_value')))
+            return Invalid('Value is not a valid datetime')
 
-        if getattr(self.field, '_min_vale', None) is not None:
-            self.check_min_value(data=data, min_value=self.parse_to_time(getattr(self.field, '_min_vale')))
+        data = self._parse_to_time(data=data, formats=self.formats)
+        if data.__class__ is Invalid:
+            return data
+        error = self._check_range(data)
+        if error is not None:
+            return error
 
         return data
 
     def DecimalField(self, data):
-        if getattr(self.field, '_max_value', None) is not None:
-            self.check_max_value(data=data, max_value=getattr(self.field, '_max_value'))
-
-        if getattr(self.field, '_min_vale', None) is not None:
-            self.check_min_value(data=data, min_value=getattr(self.field, '_min_vale'))
         try:
-            from decimal import Decimal
-            return Decimal(str(data).replace(',','.'))
+            data = Decimal(str(data).replace(',','.'))
         except Exception:
-            raise ValidationFailedException('Invalid numeric value for a decimal')
+            return Invalid('Invalid numeric value for a decimal')
+
+        error = self._check_range(data)
+        if error is not None:
+            return error
+        return data
 
     @staticmethod
     def EmailField(data) -> str:
-        try:
-            data = str(data)
-            if not re.match(r"^[a-zA-Z0-9_.+-]+@[a-zA-Z0-9-]+\.[a-zA-Z0-9-.]+$", data):
-                raise Exception
-
-            from email.utils import parseaddr
-            parsed_email = parseaddr(data)
-            if parsed_email[1] != data:
-                raise Exception
-        except Exception:
-            raise ValidationFailedException('Invalid email')
+        data = str(data)
+        if not EMAIL_PATTERN.match(data) or parseaddr(data)[1] != data:
+            return Invalid('Invalid email')
         return data
 
     def IntegerField(self, data) -> int:
+        data = str(data)
+        if not data or not all(char.isdigit() for char in data):
+            return Invalid('Invalid integer')
         try:
-            data = str(data)
-            for char in data:
-                if not char.isdigit():
-                    raise Exception
-
             data = int(data)
-        except Exception:
-            raise ValidationFailedException('Invalid integer')
+        except ValueError:
+            return Invalid('Invalid integer')
 
-        if getattr(self.field, '_max_value', None) is not None:
-            self.check_max_value(data=data, max_value=getattr(self.field, '_max_value'))
-
-        if getattr(self.field, '_min_vale', None) is not None:
-            self.check_min_value(data=data, min_value=getattr(self.field, '_min_vale'))
-        return int(data)
+        error = self._check_range(data)
+        if error is not None:
+            return error
+        return data
 
     def FloatField(self, data) -> float:
-        if getattr(self.field, '_max_value', None) is not None:
-            self.check_max_value(data=data, max_value=getattr(self.field, '_max_value'))
-
-        if getattr(self.field, '_min_vale', None) is not None:
-            self.check_min_value(data=data, min_value=getattr(self.field, '_min_vale'))
         try:
-            return float(data)
+            data = float(data)
         except Exception:
-            raise ValidationFailedException('Invalid numeric value for a float')
+            return Invalid('Invalid numeric value for a float')
 
-    def RangeField(self, data):
-        if getattr(self.field, '_max_value', None) is not None:
-            self.check_max_value(data=data, max_value=getattr(self.field, '_max_value'))
+        error = self._check_range(data)
+        if error is not None:
+            return error
+        return data
 
-        if getattr(self.field, '_min_length', None) is not None:
-            self.check_min_value(data=data, min_value=getattr(self.field, '_min_vale'))
+    def RangeField(self, data):
+        error = self._check_range(data)
+        if error is not None:
+            return error
 
         return data
 
     def RadioField(self, data) -> str:
-        return self.validate_choice_field(data=data, choices=getattr(self.field, '_choices'))
+        return self._check_choices(data=data)
 
     def TimeField(self, data):
-        if not re.match(
-                r"^((([0]?[1-9]|1[0-2])(:|\.)[0-5][0-9]((:|\.)[0-5][0-9])?( )?(AM|am|aM|Am|PM|pm|pM|Pm))|(([0]?[0-9]|1[0-9]|2[0-3])(:|\.)[0-5][0-9]((:|\.)[0-5][0-9])?))$", str(data)):
-            raise ValidationFailedException('Value is not a valid time')
-
-        data = self.parse_to_time(data=data)
-        if getattr(self.field, '_max_value', None) is not None:
-            self.check_max_value(data=data, max_value=self.parse_to_time(getattr(self.field, '_max_value')))
+        if not TIME_PATTERN.match(str(data)):
+            return Invalid('Value is not a valid time')
 
-        if getattr(self.field, '_min_value', None) is not None:
-            self.check_min_value(data=data, min_value=self.parse_to_time(getattr(self.field, '_min_vale')))
+        data = self._parse_to_time(data=data, formats=self.formats)
+        if data.__class__ is Invalid:
+            return data
+        error = self._check_range(data.time())
+        if error is not None:
+            return error
 
         return data
 
     def SlugField(self, data) -> str:
-        if getattr(self.field, '_max_length', None) is not None:
-            self.check_max_length(data=data, max_length=getattr(self.field, '_max_length'))
-
-        if getattr(self.field, '_min_length', None) is not None:
-            self.check_min_length(data=data, min_length=getattr(self.field, '_min_length'))
+        error = self._check_length(data)
+        if error is not None:
+            return error
         return self._slugify(str(data))
 
     @staticmethod
     def UrlField(data) -> str:
-
+        data = str(data)
         try:
-            data = str(data)
-            from urllib.parse import urlparse
-            if not data == urlparse(url=data).geturl():
-                raise Exception
-        except Exception:
-            raise ValidationFailedException('Invalid url')
+            is_url = data == urlparse(url=data).geturl()
+        except ValueError:
+            is_url = False
+        if not is_url:
+            return Invalid('Invalid url')
 
         return data
 
     @staticmethod
     def UuidField(data) -> str:
-        try:
-            data = str(data)
-            if not re.match(
-                    r'[a-f0-9]{8}-[a-f0-9]{4}-4[a-f0-9]{3}-[89ab][a-f0-9]{3}-[a-f0-9]{12}',
-                    data):
-                raise Exception
-        except Exception:
-            raise ValidationFailedException('Invalid uuid')
+        data = str(data)
+        if not UUID_PATTERN.match(data):
+            return Invalid('Invalid uuid')
 
         return data
 
@@ -539,70 +968,56 @@ class FormValidator(Validator):
         return data
 
     def TextField(self, data) -> str:
-        if getattr(self.field, '_max_length', None) is not None:
-            self.check_max_length(data=data, max_length=getattr(self.field, '_max_length'))
-
-        if getattr(self.field, '_min_length', None) is not None:
-            self.check_min_length(data=data, min_length=getattr(self.field, '_min_length'))
+        error = self._check_length(data)
+        if error is not None:
+            return error
         return str(data)
 
     def PasswordField(self, data) -> str:
         has_number = has_upper = has_lower = has_symbol = False
-        try:
-            data = str(data)
-            for char in data:
-                if char.isdigit():
-                    has_number = True
-                if char.islower():
-                    has_lower = True
-                if char.isupper():
-                    has_upper = True
-                if not char.isalnum():
-                    has_symbol = True
-        except Exception:
-            raise ValidationFailedException('Invalid password')
-
-        if getattr(self.field, '_max_length', None) is not None:
-            self.check_max_length(data=data, max_length=getattr(self.field, '_max_length'))
-
-        if getattr(self.field, '_min_length', None) is not None:
-            self.check_min_length(data=data, min_length=getattr(self.field, '_min_length'))
-
+        data = str(data)
+        for char in data:
+            if char.isdigit():
+                has_number = True
+            if char.islower():
+                has_lower = True
+            if char.isupper():
+                has_upper = True
+            if not char.isalnum():
+                has_symbol = True
+
+        error = self._check_length(data)
+        if error is not None:
+            return error
 
         if getattr(self.field, '_must_contain_number', None):
             if not has_number:
-                raise ValidationFailedException('Password must contain a numeric character')
+                return Invalid('Password must contain a numeric character')
 
         if getattr(self.field, '_must_contain_symbol', None):
             if not has_symbol:
-                raise ValidationFailedException('Password must contain a symbol')
+                return Invalid('Password must contain a symbol')
 
         if getattr(self.field, '_must_contain_upper_case', None):
             if not has_upper:
-                raise ValidationFailedException('Password must contain an upper case character')
+                return Invalid('Password must contain an upper case character')
 
         if getattr(self.field, '_must_contain_lower_case', None):
             if not has_lower:
-                raise ValidationFailedException('Password must contain a lower case character')
+                return Invalid('Password must contain a lower case character')
 
         return data
 
     def PhoneField(self, data) -> str:
-        try:
-            data = str(data)
-            if not re.match(
-                    r'^\s*(?:\+?(\d{1,3}))?([-. (]*(\d{3})[-. )]*)?((\d{3})[-. ]*(\d{2,4})(?:[-.x ]*(\d+))?)\s*$',
-                    data):
-                raise Exception
-        except Exception:
-            raise ValidationFailedException('Invalid Phone')
+        data = str(data)
+        if not PHONE_PATTERN.match(data):
+            return Invalid('Invalid Phone')
         if getattr(self.field, '_internationalize', None):
             if data[:1] != '+' and data[:2] != '00':
-                raise ValidationFailedException('Phone must be in international format')
+                return Invalid('Phone must be in international format')
 
         return data
 
     @staticmethod
     def HiddenField(data):
         return data
-
@@ -0,0 +1,80 @@
+from collections import namedtuple
+from itertools import islice
+from threading import Lock, Thread
+from time import monotonic
+
+from casper.exceptions.exceptions import FieldCreateFailedException
+
+
+ChoiceTable = namedtuple('ChoiceTable', ['labels', 'values', 'titles', 'index', 'option_html'])
+
+
+class ChoiceSource:
+    """choices loaded from a provider on first use instead of at class definition.
+
+    A callable provider is called again once ttl seconds have passed. Until the
+    new choices are in, requests keep getting the previous ones while a
+    background thread does the refresh. A provider giving more than max_size
+    choices fails the load instead of losing the choices past it, a failed
+    refresh keeps the previous choices."""
+
+    provider = None
+    ttl = None
+    max_size = None
+    build = None
+
+    def __init__(self, provider, build, ttl:float=None, max_size:int=None):
+        self.provider = provider
+        self.build = build
+        self.ttl = ttl if callable(provider) else None
+        self.max_size = max_size
+        self.__table = None
+        self.__loaded_at = 0
+        self.__refreshing = False
+        self.__lock = Lock()
+
+    def get(self) -> ChoiceTable:
+        table = self.__table
+        if table is None:
+            with self.__lock:
+                if self.__table is None:
+                    self.__table = self.__load()
+                    self.__loaded_at = monotonic()
+                return self.__table
+
+        if self.ttl is not None and monotonic() - self.__loaded_at > self.ttl:
+            with self.__lock:
+                start_refresh = not self.__refreshing
+                self.__refreshing = True
+            if start_refresh:
+                Thread(target=self.__refresh, daemon=True).start()
+        return table
+
+    def invalidate(self) -> None:
+        with self.__lock:
+            self.__table = None
+
+    def __load(self) -> ChoiceTable:
+        choices = self.provider() if callable(self.provider) else self.provider
+        if self.max_size is None:
+            return self.build(list(choices))
+
+        # one past the limit is enough to tell, a large provider is not read to the end
+        choices = list(islice(choices, self.max_size + 1))
+        if len(choices) > self.max_size:
+            raise FieldCreateFailedException(
+                """Choice provider returned more than choices_max_size={} choices""".format(self.max_size))
+        return self.build(choices)
+
+    def __refresh(self) -> None:
+        try:
+            table = self.__load()
+            with self.__lock:
+                self.__table = table
+        except Exception:
+            # the stale choices stay in use until the next refresh
+            pass
+        finally:
+            with self.__lock:
+                self.__loaded_at = monotonic()
+                self.__refreshing = False
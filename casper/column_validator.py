@@ -0,0 +1,145 @@
+from decimal import Decimal, InvalidOperation
+
+try:
+    import numpy
+except ImportError:
+    numpy = None
+
+
+class ColumnValidator:
+    """validates a chunk of rows one field at a time with numpy.
+
+    Only rows a column check can accept are returned, every other row is left
+    to the regular per field validation so error messages stay the same."""
+
+    column_types = ['IntegerField', 'FloatField', 'DecimalField', 'RangeField', 'CharField', 'TextField']
+    columns = None
+
+    def __init__(self, validation_plan:tuple):
+        self.columns = []
+        if numpy is None:
+            return
+
+        for field_name, field, hook in validation_plan:
+            field_type = field._get_field_type(field)
+            form_validator = field._get_form_validator()
+            if hook is not None or field._validators or field._regex or form_validator is None:
+                continue
+            if not field_type in self.column_types:
+                continue
+            bounds = [form_validator.max_value, form_validator.min_value,
+                      form_validator.max_length, form_validator.min_length]
+            if all(bound is None or type(bound) in (int, float) for bound in bounds):
+                self.columns.append((field_name, getattr(self, field_type), form_validator))
+
+    @staticmethod
+    def is_available() -> bool:
+        return numpy is not None
+
+    def run(self, rows:list) -> list:
+        clean_rows = [{} for _ in rows]
+        for field_name, checker, form_validator in self.columns:
+            column = [row.get(field_name) for row in rows]
+            indexes, values = self.__candidates(column, checker)
+            if not indexes:
+                continue
+            for index, value in checker(indexes, values, form_validator):
+                clean_rows[index][field_name] = value
+        return clean_rows
+
+    @staticmethod
+    def __candidates(column:list, checker) -> tuple:
+        # falsy values go through the required/null/blank checks of the regular path
+        types = (str,) if checker.__name__ in ['CharField', 'TextField'] else (str, int, float)
+        if checker.__name__ == 'RangeField':
+            types = (int, float)
+        indexes = [i for i, value in enumerate(column) if value and type(value) in types]
+        return indexes, [column[i] for i in indexes]
+
+    @staticmethod
+    def __strings(values:list) -> tuple:
+        strings = [str(value) for value in values]
+        lengths = numpy.fromiter(map(len, strings), dtype=numpy.int64, count=len(strings))
+        strings = numpy.array(strings)
+        # numpy drops trailing nul characters, such values are left to the regular path
+        return strings, numpy.char.str_len(strings) == lengths
+
+    @staticmethod
+    def __floats(strings, mask) -> tuple:
+        try:
+            return numpy.where(mask, strings, '0').astype(numpy.float64), mask
+        except ValueError:
+            pass
+
+        # a single bad value fails the whole cast, so this chunk is parsed value by value
+        numbers = numpy.zeros(len(strings), dtype=numpy.float64)
+        mask = mask.copy()
+        for i, string in enumerate(strings.tolist()):
+            try:
+                numbers[i] = float(string)
+            except ValueError:
+                mask[i] = False
+        return numbers, mask
+
+    @staticmethod
+    def __bounds_mask(numbers, form_validator, margin:float = 0):
+        mask = numpy.ones(len(numbers), dtype=bool)
+        max_value = form_validator.max_value
+        min_value = form_validator.min_value
+        if max_value is not None:
+            mask &= numbers <= max_value - margin * max(1, abs(max_value))
+        if min_value is not None:
+            mask &= numbers >= min_value + margin * max(1, abs(min_value))
+        return mask
+
+    @staticmethod
+    def __length_mask(lengths, form_validator):
+        mask = numpy.ones(len(lengths), dtype=bool)
+        if form_validator.max_length is not None:
+            mask &= lengths <= form_validator.max_length
+        if form_validator.min_length is not None:
+            mask &= lengths >= form_validator.min_length
+        return mask
+
+    def IntegerField(self, indexes:list, values:list, form_validator) -> list:
+        strings, mask = self.__strings(values)
+        # int() accepts exactly the decimal characters, 18 digits always fit in an int64
+        mask &= numpy.char.isdecimal(strings) & (numpy.char.str_len(strings) < 19)
+        numbers = numpy.where(mask, strings, '0').astype(numpy.int64)
+        mask &= self.__bounds_mask(numbers, form_validator)
+        return list(zip(numpy.array(indexes)[mask].tolist(), numbers[mask].tolist()))
+
+    def FloatField(self, indexes:list, values:list, form_validator) -> list:
+        strings, mask = self.__strings(values)
+        numbers, mask = self.__floats(strings, mask)
+        mask &= self.__bounds_mask(numbers, form_validator)
+        return list(zip(numpy.array(indexes)[mask].tolist(), numbers[mask].tolist()))
+
+    def DecimalField(self, indexes:list, values:list, form_validator) -> list:
+        strings, mask = self.__strings(values)
+        strings = numpy.char.replace(strings, ',', '.')
+        numbers, mask = self.__floats(strings, mask)
+
+        # floats only decide rows clear of the bounds, the clean value is still an exact Decimal
+        mask &= ~numpy.isnan(numbers) & self.__bounds_mask(numbers, form_validator, margin=1e-9)
+        accepted = []
+        for index, string in zip(numpy.array(indexes)[mask].tolist(), strings[mask].tolist()):
+            try:
+                accepted.append((index, Decimal(string)))
+            except InvalidOperation:
+                pass
+        return accepted
+
+    def RangeField(self, indexes:list, values:list, form_validator) -> list:
+        numbers = numpy.array(values, dtype=numpy.float64)
+        # past 2**53 floats cannot tell a value from its neighbour at the bound
+        mask = (numpy.abs(numbers) < 2 ** 53) & self.__bounds_mask(numbers, form_validator)
+        return [(indexes[i], values[i]) for i in numpy.flatnonzero(mask).tolist()]
+
+    def CharField(self, indexes:list, values:list, form_validator) -> list:
+        lengths = numpy.fromiter(map(len, values), dtype=numpy.int64, count=len(values))
+        mask = self.__length_mask(lengths, form_validator)
+        return [(indexes[i], values[i]) for i in numpy.flatnonzero(mask).tolist()]
+
+    def TextField(self, indexes:list, values:list, form_validator) -> list:
+        return self.CharField(indexes, values, form_validator)
@@ -1,52 +1,112 @@
-from casper.Fields import Fields, BaseButtonField
-from casper.exceptions.exceptions import ValidationFailedException
+from casper.choice_source import ChoiceSource, ChoiceTable
+from casper.remote_choice_source import RemoteChoiceSource, InMemoryChoiceSource, SqliteChoiceSource
+from casper.Fields import Fields, BaseButtonField, FormValidator, Invalid, copy_json_value
+from casper.html_template import HtmlTemplate, ATTRIBUTE_TEMPLATE
+from casper.exceptions.exceptions import FieldCreateFailedException, ValidationFailedException
 
 
 class BooleanField(Fields):
+    __slots__ = ()
+    _input_template = HtmlTemplate("""<span> <input class='{}' type='text' {} /></span>""")
     def __init__(self, data=None, **kwargs):
         super().__init__(data, **kwargs)
 
-    def _get_html_fields(self):
-        html = """<span> <input class='{}' type='text' {} /></span>""".format(self.style, super()._get_field_form_defaults())
-        res = super()._get_html_fields()
+    def _get_html_fields(self, bound=None):
+        html = self._input_template.render(self.style, super()._get_field_form_defaults(bound))
+        res = super()._get_html_fields(bound)
         res['html'] = html
         return res
 
 class ButtonField(BaseButtonField):
-    def _get_html_fields(self):
-        return super()._get_html_fields()
+    __slots__ = ()
+    def _get_html_fields(self, bound=None):
+        return super()._get_html_fields(bound)
 
     def __init__(self, **kwargs):
         super().__init__(**kwargs)
         self.field_type = 'button'
 
 class __Choices(Fields):
-    def _get_html_fields(self):
-        return super()._get_html_fields()
+    __slots__ = ('_choice_table', '_choice_source', '_remote_choices')
+    _fresh_json_keys = ('choices',)
+    def _get_html_fields(self, bound=None):
+        return super()._get_html_fields(bound)
 
-    _choices = None
-    def __init__(self, data=None, choices: list = None, **kwargs):
+    def __init__(self, data=None, choices: list = None, choices_ttl:float = None, choices_max_size:int = None,
+                 **kwargs):
         super().__init__(data, **kwargs)
-        self.set_choice(choices=choices)
+        self._choice_table = None
+        self._choice_source = None
+        self._remote_choices = None
+        if isinstance(choices, RemoteChoiceSource):
+            # options are only looked up when validating, none are rendered
+            self._remote_choices = choices
+            self._choice_table = ChoiceTable((), (), (), frozenset(), ())
+        elif callable(choices) or not isinstance(choices, (list, tuple, set, frozenset, dict, str, type(None))):
+            self._choice_source = ChoiceSource(choices, self._build_choice_table, ttl=choices_ttl,
+                                               max_size=choices_max_size)
+        else:
+            self.set_choice(choices=choices)
 
 
     def set_choice(self, choices:list = None):
+        self._choice_source = None
+        self._remote_choices = None
+        self._choice_table = self._build_choice_table(choices)
+
+    def _build_choice_table(self, choices:list = None) -> ChoiceTable:
         if choices is None or not choices:
-            from casper.exceptions.exceptions import FieldCreateFailedException
             raise FieldCreateFailedException('Required parameter choice is missing')
 
-        all_choice = []
+        labels = []
+        values = []
         for val in choices:
             if isinstance(val, dict):
-                all_choice.append(val)
+                label, value = next(iter(val.items()))
             else:
-                all_choice.append({val:val})
+                label = value = val
+            labels.append(label)
+            values.append(value)
 
-        self._choices = all_choice
+        values = tuple(values)
+        titles = tuple(str(label).title() for label in labels)
+        try:
+            index = frozenset(values)
+        except TypeError:
+            index = values
+        return ChoiceTable(tuple(labels), values, titles, index, self._build_option_html(values, titles))
+
+    def _build_option_html(self, values:tuple, titles:tuple) -> tuple:
+        return ()
+
+    def _get_json_version(self) -> int:
+        # loads or reloads the choices first, a new table bumps the version
+        self._get_choice_table()
+        return self._version
+
+    def _get_choice_table(self) -> ChoiceTable:
+        if self._choice_source is None:
+            return self._choice_table
+        table = self._choice_source.get()
+        if table is not self._choice_table:
+            # a reloaded table gets the field a new version so render caches drop the old choices
+            self._choice_table = table
+        return table
+
+    @staticmethod
+    def _get_selected(field_data, table:ChoiceTable):
+        if not field_data:
+            return frozenset()
+        if not isinstance(table.index, frozenset):
+            return field_data
+        try:
+            return frozenset(field_data)
+        except TypeError:
+            return field_data
 
-    def _get_field_data(self):
+    def _get_field_data(self, bound=None):
         try:
-            data = super()._get_field_data()
+            data = super()._get_field_data(bound)
             if data:
                 if isinstance(data,list):
                     return data
@@ -56,189 +116,229 @@ class __Choices(Fields):
             raise ValidationFailedException('Invalid data supplied for choice')
 
 
-    def as_json(self) -> {}:
-        return {**super().as_json(),**{
-            'choices': self._choices,
+    def as_json(self, bound=None) -> {}:
+        return {**super().as_json(bound),**{
+            'choices': self.__get_json_choices(),
         }}
 
+    def _copy_static_json(self) -> dict:
+        # building the choices from the table is cheaper than copying the cached ones
+        field_json = super()._copy_static_json()
+        field_json['choices'] = self.__get_json_choices()
+        return field_json
+
+    def __get_json_choices(self) -> list:
+        table = self._get_choice_table()
+        if isinstance(table.index, frozenset):
+            # hashable values are never lists or dicts, there is nothing in them to copy
+            return [{label: value} for label, value in zip(table.labels, table.values)]
+        return [{label: copy_json_value(value)} for label, value in zip(table.labels, table.values)]
+
 
 class ChoiceField(__Choices):
+    __slots__ = ('multiple',)
+    _input_template = HtmlTemplate("""<span> <select class='{}' type='number' {} """)
+    _option_template = HtmlTemplate("""<option value='{}' {}>{}</option>""")
     _multiple = False
     def __init__(self, data=None,multiple: bool = False, **kwargs):
         super().__init__(data, **kwargs)
         self.multiple = multiple
 
-    def as_json(self) -> {}:
-        return {**super().as_json(),**{
+    def _build_option_html(self, values:tuple, titles:tuple) -> tuple:
+        return tuple(self._option_template.render(value, '', title) for value, title in zip(values, titles))
+
+    def as_json(self, bound=None) -> {}:
+        return {**super().as_json(bound),**{
             'multiple': self.multiple,
         }}
 
-    def _get_html_fields(self):
-        field_data = super()._get_field_data()
-        html = """<span> <select class='{}' type='number' {} """.format(self.style, super()._get_field_form_defaults())
+    def _get_html_fields(self, bound=None):
+        field_data = super()._get_field_data(bound)
+        html = [self._input_template.render(self.style, super()._get_field_form_defaults(bound))]
         if self._multiple:
-            html += "multiple='true' "
-        html += '/>'
-
-        if self._choices:
-            for row in self._choices:
-                temp = """<option value='{}' """.format(list(row.values())[0])
-                if field_data is not None and list(row.values())[0] in field_data:
-                    temp += "selected='true' "
-                html += """{}>{}</option>""".format(temp, str(list(row.keys())[0]).title())
+            html.append("multiple='true' ")
+        html.append('/>')
+
+        table = self._get_choice_table()
+        selected = self._get_selected(field_data, table)
+        if not selected:
+            html.extend(table.option_html)
+        else:
+            for value, title, option_html in zip(table.values, table.titles, table.option_html):
+                if value in selected:
+                    self._option_template.render_into(html, value, "selected='true' ", title)
+                else:
+                    html.append(option_html)
 
-        html += '</select></span>'
+        html.append('</select></span>')
 
-        res = super()._get_base_html_fields()
-        res['html'] = html
+        res = super()._get_base_html_fields(bound)
+        res['html'] = ''.join(html)
         return res
 
 
 
 
 class CheckBoxField(ChoiceField):
+    __slots__ = ()
+    _input_template = HtmlTemplate("""<input class = '{}' type='checkbox' {} value='{}' """)
+    _choice_label_template = HtmlTemplate("""<label for='{}' class='{}'>{}</label>""")
     def __init__(self, data=None, **kwargs):
         super().__init__(data, **kwargs)
 
-    def _get_html_fields(self):
-        field_data = super()._get_field_data()
-        form_defaults = super()._get_field_form_defaults()
-
+    def _get_html_fields(self, bound=None):
+        field_data = super()._get_field_data(bound)
+        form_defaults = super()._get_field_form_defaults(bound)
 
-        html = ''
-        if self._choices:
-            for row in self._choices:
-                temp = """<input class = '{}' type='checkbox' {} value='{}' """.format(self.style, form_defaults, list(row.values())[0])
 
-                if self.name:
-                    if self.multiple:
-                        temp += """name='{}[]' """.format(self.name)
-                    else:
-                        temp += """name='{}' """.format(self.name)
+        name = ''
+        if self.name:
+            name = ATTRIBUTE_TEMPLATE.render('name', self.name + '[]' if self.multiple else self.name)
 
-                if field_data is not None and list(row.values())[0] in field_data:
-                    temp += "checked='true' >"
+        table = self._get_choice_table()
+        selected = self._get_selected(field_data, table)
+        html = []
+        for value, title in zip(table.values, table.titles):
+            self._input_template.render_into(html, self.style, form_defaults, value)
+            html.append(name)
 
-                temp += """<label for='{}' class='{}'>{}</label>""".format(self.name, self.style, str(list(row.keys())[0]).title())
+            if value in selected:
+                html.append("checked='true' >")
 
-                html += temp
+            self._choice_label_template.render_into(html, self.name, self.style, title)
 
-        html += '</select></span>'
+        html.append('</select></span>')
 
-        res = super()._get_html_fields()
-        res['html'] = html
+        res = super()._get_base_html_fields(bound)
+        res['html'] = ''.join(html)
         return res
 
 
 class CharField(Fields):
-    _max_length = None
-    _min_length = None
+    __slots__ = ('_max_length', '_min_length')
+    _input_template = HtmlTemplate("""<span> <input class='{}' type='text' {} """)
     def __init__(self,  data=None, max_length: int = None, min_length: int = None, **kwargs):
         super().__init__(data, **kwargs)
         self._max_length = max_length
         self._min_length = min_length
 
-    def as_json(self) -> {}:
-        return {**super().as_json(),**{
+    def as_json(self, bound=None) -> {}:
+        return {**super().as_json(bound),**{
             'max_length': self._max_length,
             'min_length': self._min_length,
         }}
 
-    def _get_html_fields(self):
-        html = """<span> <input class='{}' type='text' {} """.format(self.style, super()._get_field_form_defaults())
+    def _get_html_fields(self, bound=None):
+        html = self._input_template.render(self.style, super()._get_field_form_defaults(bound))
         if self._max_length:
-            html += """minlength='{}' """.format(self._min_length)
+            html += ATTRIBUTE_TEMPLATE.render('minlength', self._min_length)
 
         if self._max_length:
-            html += """maxlength='{}' """.format(self._max_length)
+            html += ATTRIBUTE_TEMPLATE.render('maxlength', self._max_length)
 
         html += '/></span>'
 
-        res = super()._get_html_fields()
+        res = super()._get_html_fields(bound)
         res['html'] = html
         return res
 
 
 class ColorField(Fields):
+    __slots__ = ()
+    _input_template = HtmlTemplate("""<span> <input class='{}' type='color' {} /></span>""")
     def __init__(self, data=None, **kwargs):
         super().__init__(data, **kwargs)
 
-    def _get_html_fields(self):
-        html = """<span> <input class='{}' type='color' {} /></span>""".format(self.style, super()._get_field_form_defaults())
-        res = super()._get_html_fields()
+    def _get_html_fields(self, bound=None):
+        html = self._input_template.render(self.style, super()._get_field_form_defaults(bound))
+        res = super()._get_html_fields(bound)
         res['html'] = html
         return res
 
 
 class DateField(Fields):
-    _max_value = None
-    _min_value = None
-    def __init__(self, data=None,max_value: str = None, min_value: str = None, **kwargs):
+    __slots__ = ('_max_value', '_min_value', '_formats')
+    _input_template = HtmlTemplate("""<span> <input class='{}' type='date' {} """)
+    def __init__(self, data=None,max_value: str = None, min_value: str = None, formats: list = None, **kwargs):
         super().__init__(data, **kwargs)
         self._max_value = max_value
         self._min_value = min_value
-
-    def as_json(self) -> {}:
-        return {**super().as_json(),**{
+        self._formats = tuple(formats or ())
+        # an unparseable bound fails when the field is created, the validator parses them again
+        self._parse_bound(max_value)
+        self._parse_bound(min_value)
+
+    def _parse_bound(self, value):
+        if value is None:
+            return None
+        value_time = FormValidator._parse_to_time(value, self._formats)
+        if value_time.__class__ is Invalid:
+            raise FieldCreateFailedException("""Invalid bound {} for {}""".format(value, self._get_field_type(self)))
+        return value_time
+
+    def as_json(self, bound=None) -> {}:
+        return {**super().as_json(bound),**{
             'max_value': self._max_value,
             'min_value': self._min_value,
         }}
 
-    def _get_html_fields(self):
-        html = """<span> <input class='{}' type='date' {} """.format(self.style, super()._get_field_form_defaults())
+    def _get_html_fields(self, bound=None):
+        html = self._input_template.render(self.style, super()._get_field_form_defaults(bound))
         if self._min_value:
-            html += """min='{}' """.format(self._min_value)
+            html += ATTRIBUTE_TEMPLATE.render('min', self._min_value)
 
         if self._max_value:
-            html += """max='{}' """.format(self._max_value)
+            html += ATTRIBUTE_TEMPLATE.render('max', self._max_value)
 
         html += '/></span>'
 
-        res = super()._get_html_fields()
+        res = super()._get_html_fields(bound)
         res['html'] = html
         return res
 
 
 class DataListField(__Choices):
+    __slots__ = ()
+    _input_template = HtmlTemplate("""<span> <input class='{}' type='text' list='{}' {} {} /><datalist id='{}' >""")
+    _option_template = HtmlTemplate("""<option value='{}' >""")
+    _value_template = HtmlTemplate("""value='{}'""")
     def __init__(self, data=None,**kwargs):
         super().__init__(data, **kwargs)
 
-    def _get_html_fields(self):
-        field_data = super()._get_field_data()
-        html = """<span> <input class='{}' type='text' list='{}' {} temp_value='' />""".format(self.style, self.name, super()._get_field_form_defaults())
-
+    def _build_option_html(self, values:tuple, titles:tuple) -> tuple:
+        return tuple(self._option_template.render(value) for value in values)
 
+    def _get_html_fields(self, bound=None):
+        field_data = super()._get_field_data(bound)
+        table = self._get_choice_table()
+        selected = self._get_selected(field_data, table)
         temp_value = ''
-        html += """<datalist id='{}' >""".format(self.name)
-        if self._choices:
-            for row in self._choices:
-                temp = """<option value='{}' >""".format(list(row.values())[0])
-                if field_data is not None and list(row.values())[0] in field_data:
-                    temp_value = """value='{}'""".format(list(row.values())[0])
-                html += temp
-
-        html += '</datalist></span>'
-
-        html = html.replace("temp_value=''", temp_value)
-        res = super()._get_base_html_fields()
-        res['html'] = html
+        if selected:
+            for value in reversed(table.values):
+                if value in selected:
+                    temp_value = self._value_template.render(value)
+                    break
+
+        html = [self._input_template.render(self.style, self.name, super()._get_field_form_defaults(bound),
+                                            temp_value, self.name)]
+        html.extend(table.option_html)
+        html.append('</datalist></span>')
+
+        res = super()._get_base_html_fields(bound)
+        res['html'] = ''.join(html)
         return res
 
 
 class DateTimeField(DateField):
-    def _get_html_fields(self):
-        res = super()._get_html_fields()
-        res['html'] = res['html'].replace("type='date'", "type='datetime-local'")
-        return res
-
+    __slots__ = ()
+    _input_template = HtmlTemplate("""<span> <input class='{}' type='datetime-local' {} """)
     def __init__(self, data=None, **kwargs):
         super().__init__(data, **kwargs)
 
 
 class IntegerField(Fields):
-    _max_value = None
-    _min_value = None
-    _step = 0
+    __slots__ = ('_max_value', '_min_value', '_step')
+    _input_template = HtmlTemplate("""<span> <input class='{}' type='number' {} """)
     def __init__(self, data=None,max_value: int = None, min_value: int = None, step:float = 0, **kwargs):
         super().__init__(data, **kwargs)
         self._max_value = max_value
@@ -247,25 +347,25 @@ class IntegerField(Fields):
         if self._get_field_type(self) == 'IntegerField':
             self._step = int(self._step)
 
-    def _get_html_fields(self):
-        html = """<span> <input class='{}' type='number' {} """.format(self.style, super()._get_field_form_defaults())
+    def _get_html_fields(self, bound=None):
+        html = self._input_template.render(self.style, super()._get_field_form_defaults(bound))
         if self._min_value:
-            html += """min='{}' """.format(self._min_value)
+            html += ATTRIBUTE_TEMPLATE.render('min', self._min_value)
 
         if self._max_value:
-            html += """max='{}' """.format(self._max_value)
+            html += ATTRIBUTE_TEMPLATE.render('max', self._max_value)
 
         if self._step:
-            html += """step='{}' """.format(self._step)
+            html += ATTRIBUTE_TEMPLATE.render('step', self._step)
 
         html += '/></span>'
 
-        res = super()._get_html_fields()
+        res = super()._get_html_fields(bound)
         res['html'] = html
         return res
 
-    def as_json(self) -> {}:
-        return {**super().as_json(),**{
+    def as_json(self, bound=None) -> {}:
+        return {**super().as_json(bound),**{
             'max_value': self._max_value,
             'min_value': self._min_value,
             'step': self._step
@@ -273,29 +373,29 @@ class IntegerField(Fields):
 
 
 class DecimalField(IntegerField):
+    __slots__ = ()
     def __init__(self, data=None, **kwargs):
         super().__init__(data, **kwargs)
 
-    def _get_html_fields(self):
-        return super()._get_html_fields()
+    def _get_html_fields(self, bound=None):
+        return super()._get_html_fields(bound)
 
 
 class EmailField(Fields):
+    __slots__ = ()
+    _input_template = HtmlTemplate("""<span> <input class='{}' type='email' {} /></span>""")
     def __init__(self, data=None, **kwargs):
         super().__init__(data, **kwargs)
 
-    def _get_html_fields(self):
-        html = """<span> <input class='{}' type='email' {} /></span>""".format(self.style, super()._get_field_form_defaults())
-        res = super()._get_html_fields()
+    def _get_html_fields(self, bound=None):
+        html = self._input_template.render(self.style, super()._get_field_form_defaults(bound))
+        res = super()._get_html_fields(bound)
         res['html'] = html
         return res
 
 
 class FileField(Fields):
-    min_size = None
-    max_size = None
-    file_type = None
-    src = None
+    __slots__ = ('min_size', 'max_size', 'file_type', 'src')
     def __init__(self, data=None, min_size:int = None,  max_size:int = None, file_type:str = None, src:str=None, **kwargs):
         super().__init__(data, **kwargs)
         self.min_size = min_size
@@ -303,47 +403,48 @@ class FileField(Fields):
         self.file_type = file_type
         self.src = src
 
-    def _get_html_fields(self):
-        return super()._get_html_fields()
+    def _get_html_fields(self, bound=None):
+        return super()._get_html_fields(bound)
 
 
 class FloatField(IntegerField):
+    __slots__ = ()
     def __init__(self, data=None, **kwargs):
         super().__init__(data, **kwargs)
 
-    def _get_html_fields(self):
-        return super()._get_html_fields()
+    def _get_html_fields(self, bound=None):
+        return super()._get_html_fields(bound)
 
 
 class HiddenField(Fields):
+    __slots__ = ()
+    _input_template = HtmlTemplate("""<span> <input class='{}' type='hidden' {} /></span>""")
     def __init__(self, data=None, **kwargs):
         super().__init__(data, **kwargs)
 
-    def _get_html_fields(self):
-        html = """<span> <input class='{}' type='hidden' {} /></span>""".format(self.style, super()._get_field_form_defaults())
-        res = super()._get_html_fields()
+    def _get_html_fields(self, bound=None):
+        html = self._input_template.render(self.style, super()._get_field_form_defaults(bound))
+        res = super()._get_html_fields(bound)
         res['html'] = html
         return res
 
 
 class ImageField(FileField):
-    width = None
-    height = None
+    __slots__ = ('width', 'height')
     def __init__(self, data=None, width:int = None, height:int = None, **kwargs):
         super().__init__(data, **kwargs)
         self.width = width
         self.height = height
         self.file_type = 'image/*'
 
-    def _get_html_fields(self):
-        return super()._get_html_fields()
+    def _get_html_fields(self, bound=None):
+        return super()._get_html_fields(bound)
 
 
 class PasswordField(CharField):
-    _must_contain_number = False
-    _must_contain_symbol = False
-    _must_contain_upper_case = False
-    _must_contain_lower_case = False
+    __slots__ = ('_must_contain_number', '_must_contain_symbol', '_must_contain_upper_case',
+                 '_must_contain_lower_case')
+    _input_template = HtmlTemplate("""<span> <input class='{}' type='password' {} """)
     def __init__(self, data=None, must_contain_number:bool = False,
                  must_contain_symbol:bool = False,
                  must_contain_upper_case:bool = False,
@@ -355,109 +456,105 @@ class PasswordField(CharField):
         self._must_contain_lower_case = must_contain_lower_case
 
 
-    def as_json(self) -> {}:
-        return {**super().as_json(),**{
+    def as_json(self, bound=None) -> {}:
+        return {**super().as_json(bound),**{
             'must_contain_number': self._must_contain_number,
             'must_contain_symbol': self._must_contain_symbol,
             'must_contain_upper_case': self._must_contain_upper_case,
             'must_contain_lower_case': self._must_contain_lower_case,
         }}
 
-    def _get_html_fields(self):
-        res = super()._get_html_fields()
-        res['html'] = res['html'].replace("type='text'", "type='password'")
-        return res
-
 
 class PhoneField(CharField):
-
+    __slots__ = ('internationalize',)
     _internationalize = False
+    _input_template = HtmlTemplate("""<span> <input class='{}' type='tel' {} """)
     def __init__(self, data=None, internationalize:bool=False, **kwargs):
         super().__init__(data, **kwargs)
         self.internationalize = internationalize
 
-    def as_json(self) -> {}:
-        return {**super().as_json(),**{
+    def as_json(self, bound=None) -> {}:
+        return {**super().as_json(bound),**{
             'internationalize': self._internationalize,
         }}
 
-    def _get_html_fields(self):
-        res = super()._get_html_fields()
-        res['html'] = res['html'].replace("type='text'", "type='tel'")
-        return res
-
 
 class RadioField(__Choices):
+    __slots__ = ()
+    _input_template = HtmlTemplate("""<input class = '{}' type='radio' {} value='{}' """)
+    _choice_label_template = HtmlTemplate("""<label for='{}' class='{}'>{}</label>""")
     def __init__(self, data=None, **kwargs):
         super().__init__(data, **kwargs)
 
-    def _get_html_fields(self):
-        field_data = super()._get_field_data()
-        form_defaults = super()._get_field_form_defaults()
-
+    def _get_html_fields(self, bound=None):
+        field_data = super()._get_field_data(bound)
+        form_defaults = super()._get_field_form_defaults(bound)
 
-        html = ''
-        if self._choices:
-            for row in self._choices:
-                temp = """<input class = '{}' type='radio' {} value='{}' """.format(self.style, form_defaults, list(row.values())[0])
 
-                if self.name:
+        name = ''
+        if self.name:
+            name = ATTRIBUTE_TEMPLATE.render('name', self.name)
 
-                        temp += """name='{}' """.format(self.name)
+        table = self._get_choice_table()
+        selected = self._get_selected(field_data, table)
+        html = []
+        for value, title in zip(table.values, table.titles):
+            self._input_template.render_into(html, self.style, form_defaults, value)
+            html.append(name)
 
-                if field_data is not None and list(row.values())[0] in field_data:
-                    temp += "checked='true' >"
+            if value in selected:
+                html.append("checked='true' >")
 
-                temp += """<label for='{}' class='{}'>{}</label>""".format(self.name, self.style, str(list(row.keys())[0]).title())
+            self._choice_label_template.render_into(html, self.name, self.style, title)
 
-                html += temp
+        html.append('</select></span>')
 
-        html += '</select></span>'
-
-        res = super()._get_html_fields()
-        res['html'] = html
+        res = super()._get_html_fields(bound)
+        res['html'] = ''.join(html)
         return res
 
 
 class RangeField(IntegerField):
+    __slots__ = ()
     def __init__(self, data=None, **kwargs):
         super().__init__(data, **kwargs)
 
-    def _get_html_fields(self):
-        return super()._get_html_fields()
+    def _get_html_fields(self, bound=None):
+        return super()._get_html_fields(bound)
 
 
 class ResetButtonField(BaseButtonField):
+    __slots__ = ()
     def __init__(self, **kwargs):
         super().__init__(**kwargs)
         self.field_type = 'reset'
 
-    def _get_html_fields(self):
-        return super()._get_html_fields()
+    def _get_html_fields(self, bound=None):
+        return super()._get_html_fields(bound)
 
 
 class SlugField(CharField):
+    __slots__ = ()
     def __init__(self, data=None, **kwargs):
         super().__init__(data, **kwargs)
 
-    def _get_html_fields(self):
-        return super()._get_html_fields()
+    def _get_html_fields(self, bound=None):
+        return super()._get_html_fields(bound)
 
 
 class SubmitButtonField(BaseButtonField):
+    __slots__ = ()
     def __init__(self, **kwargs):
         super().__init__(**kwargs)
         self.field_type = 'submit'
 
-    def _get_html_fields(self):
-        return super()._get_html_fields()
+    def _get_html_fields(self, bound=None):
+        return super()._get_html_fields(bound)
 
 
 class TextField(Fields):
-    _max_length = None
-    _min_length = None
-    _cols = None
-    _rows = None
+    __slots__ = ('_max_length', '_min_length', '_cols', '_rows')
+    _input_template = HtmlTemplate("""<span> <textarea class='{}' type='number' {} """)
     def __init__(self, data=None, rows:int=None, cols:int = None, max_length: int = None, min_length: int = None, **kwargs):
         super().__init__(data, **kwargs)
         self._max_length = max_length
@@ -466,62 +563,69 @@ class TextField(Fields):
         self._rows = rows
 
 
-    def as_json(self) -> {}:
-        return {**super().as_json(),**{
+    def as_json(self, bound=None) -> {}:
+        return {**super().as_json(bound),**{
             'max_length': self._max_length,
             'min_length': self._min_length,
             'cols': self._cols,
             'rows': self._rows,
         }}
 
-    def _get_html_fields(self):
-        html = """<span> <textarea class='{}' type='number' {} """.format(self.style, super()._get_field_form_defaults())
+    def _get_html_fields(self, bound=None):
+        html = self._input_template.render(self.style, super()._get_field_form_defaults(bound))
         if self._min_length:
-            html += """min='{}' """.format(self._min_length)
+            html += ATTRIBUTE_TEMPLATE.render('min', self._min_length)
 
         if self._max_length:
-            html += """max='{}' """.format(self._max_length)
+            html += ATTRIBUTE_TEMPLATE.render('max', self._max_length)
 
         if self._cols:
-            html += """cols='{}' """.format(self._cols)
+            html += ATTRIBUTE_TEMPLATE.render('cols', self._cols)
 
         if self._rows:
-            html += """rows='{}' """.format(self._rows)
+            html += ATTRIBUTE_TEMPLATE.render('rows', self._rows)
 
         html += '/></textarea></span>'
 
-        res = super()._get_html_fields()
+        res = super()._get_html_fields(bound)
         res['html'] = html
         return res
 
 
 class TimeField(DateField):
+    __slots__ = ()
+    _input_template = HtmlTemplate("""<span> <input class='{}' type='time' {} """)
     def __init__(self, data=None, **kwargs):
         super().__init__(data, **kwargs)
 
-    def _get_html_fields(self):
-        res = super()._get_html_fields()
-        res['html'] = res['html'].replace("type='date'", "type='time'")
-        return res
+    def _parse_bound(self, value):
+        value = super()._parse_bound(value)
+        if value is None:
+            return None
+        return value.time()
 
 
 class UrlField(Fields):
+    __slots__ = ()
+    _input_template = HtmlTemplate("""<span> <input class='{}' type='url' {} /></span>""")
     def __init__(self, data=None, **kwargs):
         super().__init__(data, **kwargs)
 
-    def _get_html_fields(self):
-        html = """<span> <input class='{}' type='url' {} /></span>""".format(self.style, super()._get_field_form_defaults())
-        res = super()._get_html_fields()
+    def _get_html_fields(self, bound=None):
+        html = self._input_template.render(self.style, super()._get_field_form_defaults(bound))
+        res = super()._get_html_fields(bound)
         res['html'] = html
         return res
 
 
 class UuidField(Fields):
+    __slots__ = ()
+    _input_template = HtmlTemplate("""<span> <input class='{}' type='text' {} /></span>""")
     def __init__(self, data=None, **kwargs):
         super().__init__(data, **kwargs)
 
-    def _get_html_fields(self):
-        html = """<span> <input class='{}' type='text' {} /></span>""".format(self.style, super()._get_field_form_defaults())
-        res = super()._get_html_fields()
+    def _get_html_fields(self, bound=None):
+        html = self._input_template.render(self.style, super()._get_field_form_defaults(bound))
+        res = super()._get_html_fields(bound)
         res['html'] = html
         return res
\ No newline at end of file
@@ -1,4 +1,17 @@
-from casper import BaseField
+import asyncio
+from inspect import isawaitable
+from time import perf_counter
+from itertools import islice, repeat
+
+from casper import BaseField, BoundField, Invalid
+from casper import instrumentation
+from casper.column_validator import ColumnValidator
+from casper.html_template import HtmlTemplate
+from casper.json_export import to_json_bytes, get_etag
+from casper.json_schema import JsonSchemaBuilder
+from casper.render_cache import RenderCache
+from casper.parallel_validator import ParallelValidator
+from casper.validator_compiler import ValidatorCompiler
 from casper.form_fields import *
 
 
@@ -9,6 +22,7 @@ class DeclaredFieldsMetaClass(type):
 
         for key, value in list(attrs.items()):
             if isinstance(value, BaseField):
+                value._set_field_name(key)
                 form_fields.append((key, value))
 
             if isinstance(value, Fields):
@@ -21,7 +35,8 @@ class DeclaredFieldsMetaClass(type):
 
         if 'Meta' in attrs:
             meta_object = vars(attrs['Meta'])
-            supported_meta = ['form_url', 'form_style', 'form_method']
+            supported_meta = ['form_url', 'form_style', 'form_method', 'render_cache', 'async_concurrency',
+                              'async_timeout', 'fail_fast', 'cost_ordered', 'compiled']
             for val in supported_meta:
                 if val in meta_object:
                     attrs['meta_'+val] = meta_object[val]
@@ -43,32 +58,77 @@ class DeclaredFieldsMetaClass(type):
 
         new_class.base_fields = declared_fields
         new_class.declared_fields = declared_fields
+        new_class.validation_plan = mcs.__compile_validation_plan(new_class, declared_fields)
+        new_class.cost_ordered_plan = mcs.__order_by_cost(new_class.validation_plan)
+
+        # every form class gets its own cache, Meta.render_cache is its size
+        render_cache_size = getattr(new_class, 'meta_render_cache', None)
+        new_class.render_cache = RenderCache(render_cache_size) if render_cache_size else None
 
         return new_class
 
+    @staticmethod
+    def __compile_validation_plan(new_class, declared_fields:dict) -> tuple:
+        plan = []
+        for key, field in declared_fields.items():
+            hook = DeclaredFieldsMetaClass.__get_field_hook(new_class, key)
+            # a hook may depend on more than the value, its results are never cached
+            field._compile_validator(cache_results=hook is None)
+            plan.append((key, field, hook))
+        return tuple(plan)
+
+    @staticmethod
+    def __order_by_cost(validation_plan:tuple) -> tuple:
+        # fields with hooks go last, hooks may read the clean data of other fields
+        return tuple(sorted(validation_plan, key=lambda step: (
+            step[2] is not None, step[1]._form_validator.cost)))
+
+    @staticmethod
+    def __get_field_hook(new_class, field_name:str):
+        hook_name = """validate_{}""".format(field_name)
+        for base in new_class.__mro__:
+            if hook_name in base.__dict__:
+                hook = base.__dict__[hook_name]
+                if callable(hook) or isinstance(hook, classmethod):
+                    return hook
+                return None
+        return None
+
 
 class BaseForm:
     valid = False
+    validation_plan = ()
+    cost_ordered_plan = ()
+    render_cache = None
+    # observers added on this class, observers holds them merged with those of its bases
+    own_observers = ()
+    observers = ()
+    schema_builder = JsonSchemaBuilder()
     __form_name = None
     __fields = None
     __base_form_fields = None
     __validated = False
-    __errors = {}
-    __clean_data = {}
-    __initial = {}
-    __data = {}
+    __errors = None
+    __clean_data = None
+    __initial = None
+    __data = None
     __style = None
     __method = None
     __url = None
+    _header_template = HtmlTemplate("""<form class='{}' action='{}' method='{}' name='{}' id='id_{}' {}>""")
+    _footer_template = HtmlTemplate(""" {} </form>""")
 
 
     def __init__(self, data:dict=None, initial:dict=None) -> None:
+        self.__errors = {}
+        self.__clean_data = {}
+        self.__initial = {}
+        self.__data = {}
         self.__fields = self.__get_form_fields()
         self.__form_name = self.__get_form_name()
         self.__base_form_fields = self.__get_base_fields()
         self.__method = self.__get_form_method()
         self.__url = self.__get_form_url()
-        self.__set_field_names()
 
         if data:
             self.__set_data(data=data)
@@ -81,45 +141,290 @@ class BaseForm:
             self.__validate()
         return self.valid
 
-    def __set_field_names(self):
-        form_fields = getattr(self, 'all_form_fields',[])
-        for key,val in form_fields:
-            if isinstance(val, BaseField):
-                val._set_field_name(key)
+    async def ais_valid(self, concurrency:int=None, timeout:float=None) -> bool:
+        """is_valid for use in a running event loop, fields are validated concurrently.
+
+        Async validators and async validate_<field> hooks are awaited, at most
+        concurrency fields at a time and each within timeout seconds, the defaults
+        come from Meta.async_concurrency and Meta.async_timeout."""
+        if self.__validated is False:
+            if concurrency is None:
+                concurrency = getattr(self, 'meta_async_concurrency', None)
+            if timeout is None:
+                timeout = getattr(self, 'meta_async_timeout', None)
+            await self.__avalidate(concurrency, timeout)
+        return self.valid
+
+    @classmethod
+    def validate_many(cls, rows, columns:bool=False, chunk_size:int=1024):
+        """validate an iterable of dicts, yielding (clean_data, errors) for each row in order.
+
+        With columns=True rows are validated chunk_size at a time with numpy where
+        it is installed, falling back to the row by row path otherwise."""
+        form = cls()
+        remote_choices = cls.__get_remote_choices()
+        column_validator = ColumnValidator(cls.validation_plan) if columns else None
+        if column_validator is not None and not column_validator.columns:
+            column_validator = None
+        if column_validator is None and not remote_choices:
+            validate = cls.__get_compiled_validator(form)
+            if validate is not None:
+                for row in rows:
+                    yield validate(row)
+                return
+            for row in rows:
+                form.__rebind(data=row)
+                form.__validate()
+                yield form.__clean_data, form.__errors
+            return
+
+        rows = iter(rows)
+        chunk = list(islice(rows, chunk_size))
+        try:
+            while chunk:
+                cls.__prefetch_choices(remote_choices, chunk)
+                column_results = column_validator.run(chunk) if column_validator else repeat(None)
+                for row, column_data in zip(chunk, column_results):
+                    form.__rebind(data=row)
+                    form.__validate(column_data)
+                    yield form.__clean_data, form.__errors
+                chunk = list(islice(rows, chunk_size))
+        finally:
+            for key, field, source in remote_choices:
+                source.end_batch()
+
+    @classmethod
+    def compiled_validator(cls):
+        """the validation of the form compiled into one function, see casper.validator_compiler.
+
+        Compiled once per class and field versions, None when only is_valid can validate the form."""
+        key = tuple(field._version for field in cls.declared_fields.values())
+        cached = cls.__dict__.get('_compiled_validator')
+        if cached is None or cached[0] != key:
+            cached = (key, ValidatorCompiler(cls).compile())
+            cls._compiled_validator = cached
+        return cached[1]
+
+    @classmethod
+    def __get_compiled_validator(cls, form):
+        # observers time each step of the interpreted validation
+        if not getattr(cls, 'meta_compiled', False) or form.__get_observers():
+            return None
+        return cls.compiled_validator()
+
+    @classmethod
+    def __get_remote_choices(cls) -> list:
+        return [(key, field, field._remote_choices) for key, field, hook in cls.validation_plan
+                if getattr(field, '_remote_choices', None) is not None]
+
+    @staticmethod
+    def __prefetch_choices(remote_choices:list, chunk:list) -> None:
+        # one lookup per source covers every row of the chunk
+        for key, field, source in remote_choices:
+            values = []
+            bound_field = BoundField(field)
+            for row in chunk:
+                bound_field._reset(row.get(key))
+                try:
+                    values.extend(field._get_field_data(bound_field) or ())
+                except ValidationFailedException:
+                    continue
+            source.prefetch(values)
+
+    @classmethod
+    def validate_parallel(cls, rows, workers:int=None, chunk_size:int=500, parallel_threshold:int=2000,
+                          columns:bool=False):
+        """validate_many spread over a process pool, results are yielded in input order"""
+        return ParallelValidator(cls, workers=workers, chunk_size=chunk_size,
+                                 parallel_threshold=parallel_threshold, columns=columns).run(rows)
+
+    def __rebind(self, data:dict) -> None:
+        self.__validated = False
+        self.__data = data
+        for key, bound_field in self.__fields.items():
+            bound_field._reset(data.get(key))
 
     def __get_base_fields(self) -> list:
-        fields = getattr(self, 'all_form_fields', [])
-        # form_fields = getattr(self, 'all_form_fields', [])
-        for key, val in fields:
+        fields = []
+        for key, val in getattr(self, 'all_form_fields', []):
+            if key in self.__fields:
+                val = self.__fields[key]
             setattr(self,key,val)
+            fields.append((key, val))
 
         return fields
 
-    def __validate(self):
+    def __validate(self, column_data:dict=None):
+        self.__validated = True
+        self.__errors = {}
+        self.__clean_data = {}
+        if column_data is None and not self.__initial:
+            validate = self.__get_compiled_validator(self)
+            if validate is not None:
+                return self.__validate_compiled(validate)
+
+        fail_fast = getattr(self, 'meta_fail_fast', False)
+        observers = self.__get_observers()
+        plan = self.validation_plan
+        if getattr(self, 'meta_cost_ordered', False):
+            plan = self.__precheck(column_data, fail_fast)
+
+        for field_name, field, hook in plan:
+            if fail_fast and self.__errors:
+                break
+            if column_data and field_name in column_data:
+                self.__clean_data[field_name] = column_data[field_name]
+                continue
+            if observers:
+                result = self.__validate_field_timed(field_name, field, hook, observers)
+            else:
+                # fields pass errors back as Invalid values, only user code is expected to raise
+                try:
+                    result = field._check(bound=self.__fields[field_name])
+                    if hook is not None and result.__class__ is not Invalid:
+                        self.__clean_data[field_name] = result
+                        result = self.__run_hook(field_name, field, hook)
+                except Exception as e:
+                    result = Invalid(str(e))
+
+            if result.__class__ is Invalid:
+                self.__errors[field_name] = result.message
+            else:
+                self.__clean_data[field_name] = result
+
+        if self.__errors:
+            self.valid = False
+            self.__clean_data = {}
+        else:
+            if plan is not self.validation_plan:
+                self.__clean_data = {field_name: self.__clean_data[field_name]
+                                     for field_name, field, hook in self.validation_plan}
+            self.valid = True
+
+    def __validate_compiled(self, validate) -> None:
+        self.__clean_data, self.__errors = validate(self.__data)
+        for field_name, error in self.__errors.items():
+            bound_field = self.__fields[field_name]
+            bound_field.field._set_error(error, bound_field)
+        for field_name, value in self.__clean_data.items():
+            self.__fields[field_name]._clean_data = value
+        self.valid = not self.__errors
+
+    def __validate_field_timed(self, field_name:str, field, hook, observers:tuple):
+        timings = {}
+        try:
+            result = field._check_timed(self.__fields[field_name], timings)
+            if hook is not None and result.__class__ is not Invalid:
+                self.__clean_data[field_name] = result
+                start = perf_counter()
+                result = self.__run_hook(field_name, field, hook)
+                timings['hook'] = perf_counter() - start
+        except Exception as e:
+            result = Invalid(str(e))
+
+        for observer in observers:
+            observer.field_timed(type(self), field_name, timings)
+        return result
+
+    def __get_observers(self) -> tuple:
+        if instrumentation.global_observers:
+            return self.observers + instrumentation.global_observers
+        return self.observers
+
+    @classmethod
+    def add_observer(cls, observer) -> None:
+        """observe this form class and its subclasses, see casper.instrumentation"""
+        cls.own_observers = cls.__dict__.get('own_observers', ()) + (observer,)
+        cls.__merge_observers()
+
+    @classmethod
+    def remove_observer(cls, observer) -> None:
+        cls.own_observers = tuple(val for val in cls.__dict__.get('own_observers', ()) if val is not observer)
+        cls.__merge_observers()
+
+    @classmethod
+    def __merge_observers(cls) -> None:
+        # merged along the mro when they change, so reading them on each request stays an attribute lookup
+        classes = [cls]
+        while classes:
+            form_class = classes.pop()
+            form_class.observers = tuple(observer for base in reversed(form_class.__mro__)
+                                         for observer in base.__dict__.get('own_observers', ()))
+            classes.extend(form_class.__subclasses__())
+
+    def __precheck(self, column_data:dict, fail_fast:bool) -> tuple:
+        """runs the cheap checks of every field, returns the rest of the plan cheapest first"""
+        for field_name, field, hook in self.cost_ordered_plan:
+            if column_data and field_name in column_data:
+                continue
+            error = field._precheck(bound=self.__fields[field_name])
+            if error is not None:
+                self.__errors[field_name] = error.message
+                if fail_fast:
+                    return ()
+        return tuple(step for step in self.cost_ordered_plan if step[0] not in self.__errors)
+
+    async def __avalidate(self, concurrency:int=None, timeout:float=None) -> None:
         self.__validated = True
-        for field in self.__fields:
-            try:
-                self.__clean_data[field] = self.__fields[field].validate()
-                field_custom_validation = """validate_{}""".format(field)
-                if hasattr(self, field_custom_validation) and callable(getattr(self, field_custom_validation)):
-                    func = getattr(self, field_custom_validation)
-                    try:
-                        self.__clean_data[field] = func()
-                    except ValidationFailedException as e:
-                        error = str(e)
-                        self.__fields[field]._set_error(error)
-                        raise ValidationFailedException(error)
-            except ValidationFailedException as e:
-                self.__errors[field] = str(e)
-            except Exception as e:
-                self.__errors[field] = str(e)
+        self.__errors = {}
+        self.__clean_data = {}
+        semaphore = asyncio.Semaphore(concurrency) if concurrency else None
+        await asyncio.gather(*(self.__avalidate_field(field_name, field, hook, semaphore, timeout)
+                               for field_name, field, hook in self.validation_plan))
 
         if self.__errors:
             self.valid = False
             self.__clean_data = {}
         else:
+            # keep the declared field order whatever order the fields finished in
+            self.__clean_data = {field_name: self.__clean_data[field_name]
+                                 for field_name, field, hook in self.validation_plan}
             self.valid = True
 
+    async def __avalidate_field(self, field_name:str, field, hook, semaphore, timeout:float) -> None:
+        if semaphore is not None:
+            async with semaphore:
+                return await self.__avalidate_field(field_name, field, hook, None, timeout)
+
+        try:
+            result = await field._acheck(bound=self.__fields[field_name], timeout=timeout)
+            if hook is not None and result.__class__ is not Invalid:
+                self.__clean_data[field_name] = result
+                result = self.__run_hook(field_name, field, hook, allow_async=True)
+                if isawaitable(result):
+                    result = await self.__await_hook(field_name, field, result, timeout)
+        except Exception as e:
+            result = Invalid(str(e))
+
+        if result.__class__ is Invalid:
+            self.__errors[field_name] = result.message
+        else:
+            self.__clean_data[field_name] = result
+
+    def __run_hook(self, field_name:str, field, hook, allow_async:bool=False):
+        """calls a validate_<field> hook, a ValidationFailedException it raises becomes an Invalid"""
+        try:
+            result = hook.__get__(self, type(self))()
+        except ValidationFailedException as e:
+            result = Invalid(str(e))
+        if not allow_async and isawaitable(result):
+            result.close()
+            result = Invalid('Async hooks need ais_valid')
+        if result.__class__ is Invalid:
+            field._set_error(result.message, self.__fields[field_name])
+        return result
+
+    async def __await_hook(self, field_name:str, field, result, timeout:float):
+        try:
+            result = await asyncio.wait_for(result, timeout)
+        except asyncio.TimeoutError:
+            result = Invalid('Validation timed out')
+        except ValidationFailedException as e:
+            result = Invalid(str(e))
+        if result.__class__ is Invalid:
+            field._set_error(result.message, self.__fields[field_name])
+        return result
+
     def data(self) -> dict:
         return self.__data
 
@@ -128,8 +433,7 @@ class BaseForm:
         for key in data:
             if key in self.__fields:
                 self.__fields[key]._set_data(data[key])
-
-        self.__validate()
+        self.__validated = False
 
     def initial_data(self) -> dict:
         return self.__initial
@@ -139,19 +443,20 @@ class BaseForm:
         for key in initial:
             if key in self.__fields:
                 self.__fields[key]._set_default(initial[key])
+        self.__validated = False
 
     def clean_data(self) -> dict:
         if self.__validated is False:
-            raise Exception('not validated')
+            self.__validate()
         return self.__clean_data
 
     def errors(self) -> dict:
         if self.__validated is False:
-            raise Exception('not validated')
+            self.__validate()
         return self.__errors
 
-    def __get_form_fields(self) -> list:
-        return getattr(self,'declared_fields', [])
+    def __get_form_fields(self) -> dict:
+        return {key: BoundField(val) for key, val in getattr(self, 'declared_fields', {}).items()}
 
     def __get_form_name(self) -> str:
         return getattr(self,'form_name', 'form')
@@ -169,48 +474,159 @@ class BaseForm:
         return "as p"
 
     def as_html(self) -> str:
-        tail = ''
-        html = ''
+        observers = self.__get_observers()
+        if not observers:
+            return self.__as_html()
+
+        start = perf_counter()
+        html = self.__as_html()
+        seconds = perf_counter() - start
+        for observer in observers:
+            observer.render_timed(type(self), 'as_html', seconds)
+        return html
+
+    def __as_html(self) -> str:
+        if self.render_cache is None or not self.__is_unbound():
+            return self.__render_html()
+
+        key = ('as_html', self.__get_meta_key(), self.__get_fields_version())
+        html = self.render_cache.get(key)
+        if html is None:
+            html = self.__render_html()
+            self.render_cache.set(key, html)
+        return html
+
+    def __render_html(self) -> str:
+        tail = []
+        html = [self.__get_form_output_header()]
         for key, val in self.__base_form_fields:
-            if isinstance(val, SubmitButtonField) or isinstance(val, ResetButtonField):
-                tail = tail + val.as_html()
+            if self.__is_form_button(val):
+                self.__render_field_html(key, val, tail)
             else:
-                html = html + val.as_html()
-        return (self.__get_form_output_header() + html + tail + self.__get_html_output_base()).replace('None','')
+                self.__render_field_html(key, val, html)
+        html.extend(tail)
+        html.append(self.__get_html_output_base())
+        return ''.join(html)
+
+    def iter_html(self):
+        """yields the same markup as as_html one field at a time, for streaming responses"""
+        yield self.__get_form_output_header()
+        for buttons in (False, True):
+            for key, val in self.__base_form_fields:
+                if self.__is_form_button(val) is buttons:
+                    html = []
+                    self.__render_field_html(key, val, html)
+                    yield ''.join(html)
+        yield self.__get_html_output_base()
+
+    async def iter_html_async(self):
+        for html in self.iter_html():
+            yield html
+            # hand control back to the event loop between fields
+            await asyncio.sleep(0)
+
+    @staticmethod
+    def __is_form_button(val) -> bool:
+        return isinstance(val, SubmitButtonField) or isinstance(val, ResetButtonField)
+
+    def __render_field_html(self, key:str, val, parts:list) -> None:
+        # fields without data or errors render the same for every instance
+        if self.render_cache is None or not val._is_pristine():
+            val.render_html(parts)
+            return
+
+        # the json version reloads expired choices first, a new table is a new version
+        cache_key = ('field_html', key, val._get_json_version())
+        html = self.render_cache.get(cache_key)
+        if html is None:
+            field_parts = []
+            val.render_html(field_parts)
+            html = ''.join(field_parts)
+            self.render_cache.set(cache_key, html)
+        parts.append(html)
+
+    def __is_unbound(self) -> bool:
+        for key, val in self.__base_form_fields:
+            if not val._is_pristine():
+                return False
+        return True
+
+    def __get_meta_key(self) -> tuple:
+        return self.__url, self.__method, self.__style
+
+    def __get_fields_version(self) -> tuple:
+        return tuple(val._get_json_version() for key, val in self.__base_form_fields)
+
+    @classmethod
+    def invalidate_render_cache(cls) -> None:
+        if cls.render_cache is not None:
+            cls.render_cache.clear()
 
     def as_table(self):
         return "as table"
 
     def as_json(self) -> list:
-        response = []
-
-        for key,val in self.__base_form_fields:
-            response.append(val.as_json())
+        observers = self.__get_observers()
+        if not observers:
+            return self.__as_json()
+
+        start = perf_counter()
+        response = self.__as_json()
+        seconds = perf_counter() - start
+        for observer in observers:
+            observer.render_timed(type(self), 'as_json', seconds)
         return response
 
+    def __as_json(self) -> list:
+        # every field keeps its static json, only data, default and error are added per call
+        return [val._get_json() for key, val in self.__base_form_fields]
+
+    def as_json_bytes(self) -> tuple:
+        """as_json serialized to bytes along with an etag for it, orjson is used when installed.
+
+        With Meta.render_cache the bytes of unbound forms are serialized once per version."""
+        if self.render_cache is None or not self.__is_unbound():
+            body = to_json_bytes(self.as_json())
+            return body, get_etag(body)
+
+        key = ('as_json_bytes', tuple(val._get_json_version() for key, val in self.__base_form_fields))
+        export = self.render_cache.get(key)
+        if export is None:
+            body = to_json_bytes(self.as_json())
+            export = (body, get_etag(body))
+            self.render_cache.set(key, export)
+        return export
+
+    @classmethod
+    def json_schema(cls) -> dict:
+        """JSON Schema of the data the form accepts, built once per class and field versions"""
+        key = tuple(field._get_json_version() for field in cls.declared_fields.values())
+        cached = cls.__dict__.get('_json_schema')
+        if cached is None or cached[0] != key:
+            cached = (key, cls.schema_builder.form_schema(cls))
+            cls._json_schema = cached
+        return cached[1]
+
     def __get_form_output_header(self) -> str:
         has_file = False
         replace = ''
-        html = """<form class='{}' action='{}' method='{}' name='{}' id='id_{}' form_enctype>"""\
-            .format(self.__style, self.__url, self.__method, self.__form_name, self.__form_name)
-
-        for key,val in self.__base_form_fields:
+        for key,val in getattr(self, 'all_form_fields', []):
             if isinstance(val, FileField):
                 has_file = True
         if has_file:
             replace = 'enctype="multipart/form-data"'
-        return html.replace('form_enctype', replace)
+        return self._header_template.render(self.__style, self.__url, self.__method, self.__form_name,
+                                            self.__form_name, replace)
 
     def __get_html_output_base(self) -> str:
         has_submit = False
         replace = ''
-        html = """ form_submit </form>"""
-        for key,val in self.__base_form_fields:
+        for key,val in getattr(self, 'all_form_fields', []):
             if isinstance(val, SubmitButtonField):
                 has_submit = True
         if not has_submit:
             replace = '<input type="submit" value="Submit">'
-        return html.replace('form_submit', replace)
+        return self._footer_template.render(replace)
 
     @staticmethod
     def __send_html_output(self):
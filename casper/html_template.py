@@ -0,0 +1,45 @@
+from string import Formatter
+
+
+class HtmlTemplate:
+    """markup compiled once into static chunks and the slots between them.
+
+    Slots are filled positionally for '{}' or by keyword for '{name}', a None
+    value renders as an empty slot."""
+    __slots__ = ('head', 'slots')
+
+    def __init__(self, template:str):
+        chunks = ['']
+        names = []
+        auto_index = 0
+        for literal, field_name, format_spec, conversion in Formatter().parse(template):
+            chunks[-1] += literal
+            if field_name is None:
+                continue
+            if field_name == '':
+                field_name = auto_index
+                auto_index += 1
+            elif field_name.isdigit():
+                field_name = int(field_name)
+            names.append(field_name)
+            chunks.append('')
+
+        self.head = chunks[0]
+        self.slots = tuple(zip(names, chunks[1:]))
+
+    def render(self, *args, **kwargs) -> str:
+        parts = []
+        self.render_into(parts, *args, **kwargs)
+        return ''.join(parts)
+
+    def render_into(self, parts:list, *args, **kwargs) -> None:
+        append = parts.append
+        append(self.head)
+        for name, chunk in self.slots:
+            value = kwargs[name] if name.__class__ is str else args[name]
+            if value is not None:
+                append(value if value.__class__ is str else str(value))
+            append(chunk)
+
+
+ATTRIBUTE_TEMPLATE = HtmlTemplate("""{}='{}' """)
@@ -0,0 +1,100 @@
+from bisect import bisect_left
+from threading import Lock
+
+
+# observers notified for every form class, see add_observer
+global_observers = ()
+
+
+class FormObserver:
+    """receives validation and render timings in seconds, override the methods you need.
+
+    field_timed gets a dict with a 'general', 'checker', 'validators' and 'hook'
+    entry for each step that ran for the field."""
+
+    def field_timed(self, form_class, field_name:str, timings:dict) -> None:
+        pass
+
+    def render_timed(self, form_class, method:str, seconds:float) -> None:
+        pass
+
+
+def add_observer(observer:FormObserver) -> None:
+    """observe every form, use Form.add_observer to observe a single form class"""
+    global global_observers
+    global_observers = global_observers + (observer,)
+
+
+def remove_observer(observer:FormObserver) -> None:
+    global global_observers
+    global_observers = tuple(val for val in global_observers if val is not observer)
+
+
+class TimingHistogram:
+    """counts of timings per bucket, each bucket holding the timings up to its upper bound"""
+
+    def __init__(self, bounds:tuple):
+        self.bounds = bounds
+        self.counts = [0] * (len(bounds) + 1)
+        self.count = 0
+        self.sum = 0.0
+
+    def add(self, seconds:float) -> None:
+        self.counts[bisect_left(self.bounds, seconds)] += 1
+        self.count += 1
+        self.sum += seconds
+
+    def as_dict(self) -> dict:
+        buckets = []
+        total = 0
+        for bound, count in zip(self.bounds + (float('inf'),), self.counts):
+            total += count
+            buckets.append((bound, total))
+        return {'count': self.count, 'sum': self.sum, 'buckets': buckets}
+
+
+class TimingAggregator(FormObserver):
+    """collects timings into histograms keyed on (form, field or render method, step)"""
+
+    bounds = (1e-6, 5e-6, 1e-5, 5e-5, 1e-4, 5e-4, 1e-3, 5e-3, 1e-2, 5e-2, 1e-1, 5e-1, 1.0)
+
+    def __init__(self, bounds:tuple=None):
+        if bounds is not None:
+            self.bounds = tuple(bounds)
+        self.__histograms = {}
+        self.__lock = Lock()
+
+    def field_timed(self, form_class, field_name:str, timings:dict) -> None:
+        with self.__lock:
+            for step, seconds in timings.items():
+                self.__get_histogram((form_class.__name__, field_name, step)).add(seconds)
+
+    def render_timed(self, form_class, method:str, seconds:float) -> None:
+        with self.__lock:
+            self.__get_histogram((form_class.__name__, method, 'render')).add(seconds)
+
+    def __get_histogram(self, key:tuple) -> TimingHistogram:
+        histogram = self.__histograms.get(key)
+        if histogram is None:
+            histogram = self.__histograms[key] = TimingHistogram(self.bounds)
+        return histogram
+
+    def histograms(self) -> dict:
+        with self.__lock:
+            return {key: histogram.as_dict() for key, histogram in self.__histograms.items()}
+
+    def reset(self) -> None:
+        with self.__lock:
+            self.__histograms.clear()
+
+    def to_prometheus(self, name:str='casper_form_seconds') -> str:
+        """the histograms in the prometheus text exposition format"""
+        lines = ["""# TYPE {} histogram""".format(name)]
+        for (form, target, step), histogram in sorted(self.histograms().items()):
+            labels = 'form="{}",target="{}",step="{}"'.format(form, target, step)
+            for bound, count in histogram['buckets']:
+                le = '+Inf' if bound == float('inf') else repr(bound)
+                lines.append('{}_bucket{{{},le="{}"}} {}'.format(name, labels, le, count))
+            lines.append('{}_sum{{{}}} {}'.format(name, labels, histogram['sum']))
+            lines.append('{}_count{{{}}} {}'.format(name, labels, histogram['count']))
+        return '\n'.join(lines) + '\n'
@@ -0,0 +1,36 @@
+import json
+from enum import Enum
+from hashlib import blake2b
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+if orjson is not None:
+    # datetimes and dataclasses go through json_default as they would without orjson
+    ORJSON_OPTIONS = orjson.OPT_NON_STR_KEYS | orjson.OPT_PASSTHROUGH_DATETIME | orjson.OPT_PASSTHROUGH_DATACLASS
+
+
+def json_default(value):
+    if isinstance(value, Enum):
+        return value.value
+    return str(value)
+
+
+def to_json_bytes(data) -> bytes:
+    """compact json for data, values json cannot represent (dates, decimals) are written as strings.
+
+    The bytes are the same with or without orjson, except for nan and infinity
+    which orjson writes as null."""
+    if orjson is not None:
+        try:
+            return orjson.dumps(data, default=json_default, option=ORJSON_OPTIONS)
+        except TypeError:
+            # integers past 64 bits and the like, the json module handles them
+            pass
+    return json.dumps(data, default=json_default, separators=(',', ':'), ensure_ascii=False).encode('utf-8')
+
+
+def get_etag(body:bytes) -> str:
+    return '"{}"'.format(blake2b(body, digest_size=16).hexdigest())
@@ -0,0 +1,215 @@
+from decimal import Decimal
+
+from casper.Fields import COLOR_PATTERN, EMAIL_PATTERN, PHONE_PATTERN, TIME_PATTERN, UUID_PATTERN
+
+JSON_SCHEMA_DIALECT = 'https://json-schema.org/draft/2020-12/schema'
+# the json values python treats as false, an optional field takes any of them
+FALSY_VALUES = (None, False, 0, '', [], {})
+
+
+class JsonSchemaBuilder:
+    """JSON Schema for the payload a form accepts, built from its declared fields.
+
+    Each field type has a method of its name returning the type part of the
+    field's schema, the generic options (required, null, regex, default) are
+    added by field_schema. A schema may accept values the form rejects but
+    never the other way round, so no json schema formats are used, they are
+    stricter than the checkers in places. Fields that read any value through
+    str() get no type, their string keywords only constrain strings."""
+
+    def form_schema(self, form_class) -> dict:
+        properties = {}
+        required = []
+        for field_name, field in form_class.declared_fields.items():
+            properties[field_name] = self.field_schema(field)
+            if field._required:
+                required.append(field_name)
+
+        schema = {
+            '$schema': JSON_SCHEMA_DIALECT,
+            'title': form_class.__name__,
+            'type': 'object',
+            'properties': properties,
+        }
+        if required:
+            schema['required'] = required
+        return schema
+
+    def field_schema(self, field) -> dict:
+        field_type = field._get_field_type(field)
+        builder = getattr(self, field_type, None)
+        schema = builder(field) if callable(builder) else {}
+
+        if field._regex:
+            # the field matches from the start, json schema patterns search anywhere
+            regex = field._regex if field._full_match else self.__pattern(field._regex)
+            schema['pattern'] = """^(?:{}){}""".format(regex, '$' if field._full_match else '')
+
+        # falsy values are replaced by the default before the required, null and blank checks
+        rejects_falsy = not field._default and (field._required or not field._allow_blank or (
+            field._default is None and not field._allow_null))
+        types = schema.get('type', ['string', 'array'])
+        if not isinstance(types, list):
+            types = [types]
+        if rejects_falsy:
+            if 'string' in types:
+                schema.setdefault('minLength', 1)
+            if 'array' in types:
+                schema['minItems'] = 1
+        elif schema:
+            schema = {'anyOf': [schema, {'enum': list(FALSY_VALUES)}]}
+
+        if field.label and field.label != field.name:
+            schema['title'] = field.label
+        if field.help_text:
+            schema['description'] = field.help_text
+        if field._default is not None:
+            schema['default'] = self.__json_value(field._default)
+        if field._read_only:
+            schema['readOnly'] = True
+        return schema
+
+    @staticmethod
+    def __json_value(value):
+        if value is None or isinstance(value, (bool, int, float, str)):
+            return value
+        if isinstance(value, (list, tuple)):
+            return [JsonSchemaBuilder.__json_value(val) for val in value]
+        if isinstance(value, Decimal):
+            return float(value)
+        return str(value)
+
+    @staticmethod
+    def __pattern(pattern:str) -> str:
+        # a python $ also matches before a trailing newline, an ecma-262 $ does not
+        if pattern.endswith('$') and not pattern.endswith('\\$'):
+            return pattern[:-1] + r'\n?$'
+        return pattern
+
+    @staticmethod
+    def __lengths(field, schema:dict) -> dict:
+        if getattr(field, '_max_length', None) is not None:
+            schema['maxLength'] = field._max_length
+        if getattr(field, '_min_length', None) is not None:
+            schema['minLength'] = field._min_length
+        return schema
+
+    @staticmethod
+    def __bounds(field, schema:dict) -> dict:
+        if getattr(field, '_max_value', None) is not None:
+            schema['maximum'] = JsonSchemaBuilder.__json_value(field._max_value)
+        if getattr(field, '_min_value', None) is not None:
+            schema['minimum'] = JsonSchemaBuilder.__json_value(field._min_value)
+        return schema
+
+    def __choices(self, field) -> dict:
+        # every choice field takes a list of values or a string split on commas into one
+        if field._remote_choices is not None:
+            # too many options to list, only the remote source can tell
+            return {'type': ['array', 'string']}
+
+        values = [self.__json_value(value) for value in field._get_choice_table().values]
+        return {'type': ['array', 'string'], 'items': {'enum': values}}
+
+    def CharField(self, field) -> dict:
+        return self.__lengths(field, {})
+
+    def TextField(self, field) -> dict:
+        return self.__lengths(field, {})
+
+    def SlugField(self, field) -> dict:
+        return self.__lengths(field, {})
+
+    def PasswordField(self, field) -> dict:
+        return self.__lengths(field, {'writeOnly': True})
+
+    @staticmethod
+    def HiddenField(field) -> dict:
+        return {}
+
+    @staticmethod
+    def FileField(field) -> dict:
+        return {}
+
+    @staticmethod
+    def ImageField(field) -> dict:
+        return {'contentMediaType': 'image/*'}
+
+    @staticmethod
+    def EmailField(field) -> dict:
+        return {'type': 'string', 'pattern': JsonSchemaBuilder.__pattern(EMAIL_PATTERN.pattern)}
+
+    @staticmethod
+    def UrlField(field) -> dict:
+        # anything urlparse gives back unchanged, relative urls included
+        return {}
+
+    @staticmethod
+    def UuidField(field) -> dict:
+        return {'type': 'string', 'pattern': '^' + UUID_PATTERN.pattern}
+
+    @staticmethod
+    def ColorField(field) -> dict:
+        return {'type': 'string', 'pattern': JsonSchemaBuilder.__pattern(COLOR_PATTERN.pattern)}
+
+    @staticmethod
+    def PhoneField(field) -> dict:
+        # numbers are checked as the string of their digits
+        return {'pattern': JsonSchemaBuilder.__pattern(PHONE_PATTERN.pattern)}
+
+    @staticmethod
+    def BooleanField(field) -> dict:
+        # 1 and 0 are equal to True and False, the strings are matched ignoring case
+        return {'type': ['boolean', 'string', 'integer']}
+
+    def IntegerField(self, field) -> dict:
+        # digit strings in any script are accepted as well as integers
+        return self.__bounds(field, {'type': ['integer', 'string']})
+
+    def FloatField(self, field) -> dict:
+        return self.__bounds(field, {'type': ['number', 'string', 'boolean']})
+
+    def DecimalField(self, field) -> dict:
+        return self.__bounds(field, {'type': ['number', 'string']})
+
+    def RangeField(self, field) -> dict:
+        # without bounds there is nothing to compare, any value is accepted
+        if field._max_value is None and field._min_value is None:
+            return {}
+        return self.__bounds(field, {'type': ['number', 'boolean']})
+
+    @staticmethod
+    def DateField(field) -> dict:
+        # iso dates, the formats of the field and whatever dateutil can parse
+        return {}
+
+    @staticmethod
+    def DateTimeField(field) -> dict:
+        return {'type': 'string', 'pattern': ':'}
+
+    @staticmethod
+    def TimeField(field) -> dict:
+        # numbers are read by dateutil, the pattern only constrains strings
+        return {'pattern': JsonSchemaBuilder.__pattern(TIME_PATTERN.pattern)}
+
+    def ChoiceField(self, field) -> dict:
+        return self.__choices(field)
+
+    def CheckBoxField(self, field) -> dict:
+        return self.__choices(field)
+
+    def RadioField(self, field) -> dict:
+        return self.__choices(field)
+
+    def DataListField(self, field) -> dict:
+        return self.__choices(field)
+
+
+def openapi_components(*form_classes) -> dict:
+    """the json_schema of each form as an OpenAPI 3.1 components object"""
+    schemas = {}
+    for form_class in form_classes:
+        schema = dict(form_class.json_schema())
+        schema.pop('$schema')
+        schemas[form_class.__name__] = schema
+    return {'components': {'schemas': schemas}}
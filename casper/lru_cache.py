@@ -0,0 +1,39 @@
+from collections import OrderedDict
+from threading import Lock
+
+
+class LruCache:
+    """least recently used cache with hit and miss counts, safe to share between threads"""
+
+    max_size = 128
+    hits = 0
+    misses = 0
+
+    def __init__(self, max_size:int=128):
+        self.max_size = max_size
+        self.__entries = OrderedDict()
+        self.__lock = Lock()
+
+    def get(self, key):
+        with self.__lock:
+            value = self.__entries.get(key)
+            if value is None:
+                self.misses += 1
+                return None
+            self.__entries.move_to_end(key)
+            self.hits += 1
+            return value
+
+    def set(self, key, value) -> None:
+        with self.__lock:
+            self.__entries[key] = value
+            self.__entries.move_to_end(key)
+            while len(self.__entries) > self.max_size:
+                self.__entries.popitem(last=False)
+
+    def clear(self) -> None:
+        with self.__lock:
+            self.__entries.clear()
+
+    def __len__(self) -> int:
+        return len(self.__entries)
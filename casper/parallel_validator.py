@@ -0,0 +1,62 @@
+import os
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from itertools import islice
+
+
+def validate_chunk(form_class, rows:list, columns:bool=False) -> list:
+    return list(form_class.validate_many(rows, columns=columns))
+
+
+class ParallelValidator:
+    """shards rows across worker processes, only the form class and the raw dicts are sent over.
+
+    Batches smaller than parallel_threshold are validated in process, where the
+    cost of starting workers and pickling rows would outweigh the gain."""
+
+    form_class = None
+    workers = None
+    chunk_size = 500
+    parallel_threshold = 2000
+    columns = False
+
+    def __init__(self, form_class, workers:int=None, chunk_size:int=500, parallel_threshold:int=2000,
+                 columns:bool=False):
+        self.form_class = form_class
+        self.workers = workers or os.cpu_count() or 1
+        self.chunk_size = max(1, chunk_size)
+        self.parallel_threshold = parallel_threshold
+        self.columns = columns
+
+    def run(self, rows):
+        rows = iter(rows)
+        head = list(islice(rows, max(self.parallel_threshold, self.chunk_size)))
+        if self.workers < 2 or len(head) < self.parallel_threshold:
+            yield from self.form_class.validate_many(head, columns=self.columns)
+            yield from self.form_class.validate_many(rows, columns=self.columns)
+            return
+
+        yield from self.__run_parallel(head, rows)
+
+    def __chunks(self, head:list, rows):
+        for start in range(0, len(head), self.chunk_size):
+            yield head[start:start + self.chunk_size]
+        chunk = list(islice(rows, self.chunk_size))
+        while chunk:
+            yield chunk
+            chunk = list(islice(rows, self.chunk_size))
+
+    def __run_parallel(self, head:list, rows):
+        # at most two chunks per worker are in flight so memory stays flat on long inputs
+        pending = deque()
+        with ProcessPoolExecutor(max_workers=self.workers) as executor:
+            try:
+                for chunk in self.__chunks(head, rows):
+                    pending.append(executor.submit(validate_chunk, self.form_class, chunk, self.columns))
+                    if len(pending) >= self.workers * 2:
+                        yield from pending.popleft().result()
+                while pending:
+                    yield from pending.popleft().result()
+            finally:
+                for future in pending:
+                    future.cancel()
@@ -0,0 +1,105 @@
+import sqlite3
+from threading import Lock
+
+from casper.lru_cache import LruCache
+
+
+class RemoteChoiceSource:
+    """choices too many to load, asked about a batch of values at a time.
+
+    Subclasses implement contains_many. Values it confirms are kept in a least
+    recently used cache so repeat submissions skip the round trip."""
+
+    cache_size = 4096
+
+    def __init__(self, cache_size:int=4096):
+        self.cache_size = cache_size
+        self.confirmed = LruCache(cache_size)
+        self.__rejected = frozenset()
+
+    def contains_many(self, values:set) -> set:
+        """returns the values that are valid options, called once per lookup"""
+        raise NotImplementedError('contains_many must be implemented by the choice source')
+
+    def contains(self, values) -> set:
+        members = set()
+        missing = set()
+        for val in values:
+            try:
+                if self.confirmed.get(val) is not None:
+                    members.add(val)
+                elif val not in self.__rejected:
+                    missing.add(val)
+            except TypeError:
+                continue
+
+        if missing:
+            for val in self.contains_many(missing):
+                self.confirmed.set(val, True)
+                members.add(val)
+        return members
+
+    def prefetch(self, values) -> None:
+        """look up the values of a whole batch of rows in one round trip.
+
+        Values found missing are remembered until the next prefetch or end_batch."""
+        hashable = set()
+        for val in values:
+            try:
+                hashable.add(val)
+            except TypeError:
+                continue
+        values = hashable
+        members = self.contains(values)
+        self.__rejected = frozenset(values - members)
+
+    def end_batch(self) -> None:
+        self.__rejected = frozenset()
+
+
+class InMemoryChoiceSource(RemoteChoiceSource):
+    """remote choice source backed by a set, a stand-in for tests"""
+
+    def __init__(self, values, cache_size:int=4096):
+        super().__init__(cache_size=cache_size)
+        self.values = frozenset(values)
+        self.lookups = 0
+
+    def contains_many(self, values:set) -> set:
+        self.lookups += 1
+        return values & self.values
+
+
+class SqliteChoiceSource(RemoteChoiceSource):
+    """remote choice source reading one column of a sqlite table"""
+
+    # sqlite allows 999 parameters per statement in older builds
+    max_parameters = 900
+
+    def __init__(self, database:str, table:str, column:str, cache_size:int=4096):
+        super().__init__(cache_size=cache_size)
+        for name in (table, column):
+            if not name.isidentifier():
+                raise ValueError("""{} is not a valid sqlite identifier""".format(name))
+        self.database = database
+        self.query = """SELECT "{0}" FROM "{1}" WHERE "{0}" IN ({{}})""".format(column, table)
+        self.__connection = None
+        self.__lock = Lock()
+
+    def contains_many(self, values:set) -> set:
+        values = list(values)
+        members = set()
+        with self.__lock:
+            if self.__connection is None:
+                self.__connection = sqlite3.connect(self.database, check_same_thread=False)
+            for start in range(0, len(values), self.max_parameters):
+                batch = values[start:start + self.max_parameters]
+                query = self.query.format(','.join('?' * len(batch)))
+                members.update(row[0] for row in self.__connection.execute(query, batch))
+        return members
+
+    def close(self) -> None:
+        with self.__lock:
+            if self.__connection is not None:
+                self.__connection.close()
+                self.__connection = None
@@ -0,0 +1,5 @@
+from casper.lru_cache import LruCache
+
+
+class RenderCache(LruCache):
+    """least recently used cache for rendered forms and fields, shared by all instances of a form class"""
@@ -0,0 +1,241 @@
+from email.utils import parseaddr
+
+from casper.Fields import Fields, Invalid, FormValidator, COLOR_PATTERN, EMAIL_PATTERN, PHONE_PATTERN, UUID_PATTERN
+
+
+class ValidatorCompiler:
+    """writes the validation of a form class as the source of one function and compiles it.
+
+    The generated validate(data) -> (clean_data, errors) gives the same results as
+    is_valid on a form bound to data, with the options of every field inlined as
+    constants and no code for the options that are not set. Field types without a
+    method here call their FormValidator checker. Forms with validate_<field> hooks,
+    field validators or data set on a field definition are not compiled."""
+
+    # fields reading a comma separated string as a list of values, see __Choices._get_field_data
+    split_data_fields = ('ChoiceField', 'CheckBoxField', 'RadioField', 'DataListField')
+
+    def __init__(self, form_class):
+        self.form_class = form_class
+        self.namespace = {'Invalid': Invalid, 'invalid_choice_data': Invalid('Invalid data supplied for choice'),
+                          'parseaddr': parseaddr, 'slugify': FormValidator._slugify,
+                          'color_match': COLOR_PATTERN.match, 'email_match': EMAIL_PATTERN.match,
+                          'phone_match': PHONE_PATTERN.match, 'uuid_match': UUID_PATTERN.match}
+
+    def can_compile(self) -> bool:
+        for field_name, field, hook in self.form_class.validation_plan:
+            if hook is not None or field._validators or field._data is not None:
+                return False
+            if (type(field)._get_field_data is not Fields._get_field_data
+                    and field._get_field_type(field) not in self.split_data_fields):
+                return False
+        return not getattr(self.form_class, 'meta_cost_ordered', False)
+
+    def compile(self):
+        """the compiled validate function, None when the form has to be validated by is_valid"""
+        if not self.can_compile():
+            return None
+        source = self.source()
+        code = compile(source, """<compiled {}>""".format(self.form_class.__name__), 'exec')
+        exec(code, self.namespace)
+        validate = self.namespace['validate']
+        validate.source = source
+        return validate
+
+    def source(self) -> str:
+        fail_fast = getattr(self.form_class, 'meta_fail_fast', False)
+        lines = ['def validate(data):', '    clean = {}', '    errors = {}']
+        plan = self.form_class.validation_plan
+        for index, (field_name, field, hook) in enumerate(plan):
+            lines.extend(self.field_source(index, field_name, field))
+            if fail_fast and index < len(plan) - 1:
+                lines.extend(['    if errors:', '        return {}, errors'])
+        lines.extend(['    if errors:', '        return {}, errors', '    return clean, errors', ''])
+        return '\n'.join(lines)
+
+    def field_source(self, index:int, field_name:str, field) -> list:
+        form_validator = field._get_form_validator()
+        name = repr(field_name)
+        lines = [
+            """    value = data.get({})""".format(name),
+            '    if not value:',
+            """        value = {}""".format(self.__constant(index, 'default', field._default)),
+        ]
+
+        # the general checks of FormValidator.check_general, in its order
+        branches = []
+        if field._get_field_type(field) in self.split_data_fields:
+            lines.extend([
+                '    if not value:',
+                '        value = None',
+                '    elif not isinstance(value, list):',
+                '        try:',
+                "            value = value.split(',')",
+                '        except Exception:',
+                '            value = invalid_choice_data',
+            ])
+            branches.append(('value.__class__ is Invalid', """errors[{}] = value.message""".format(name)))
+        if field._required:
+            branches.append(('not value', """errors[{}] = 'This field is required'""".format(name)))
+        if not field._allow_null:
+            branches.append(('value is None', """errors[{}] = 'This field cannot be null'""".format(name)))
+        if not field._allow_blank:
+            branches.append(('not value', """errors[{}] = 'This field cannot be blank'""".format(name)))
+        if field._allow_null:
+            branches.append(('value is None', """clean[{}] = None""".format(name)))
+
+        body = self.__render_steps(self.type_steps(index, form_validator), name)
+        if len(body) > 1:
+            body = ['try:'] + ['    ' + line for line in body] + ['except Exception as e:',
+                                                                   """    errors[{}] = str(e)""".format(name)]
+
+        keyword = 'if'
+        for condition, statement in branches:
+            lines.extend(["""    {} {}:""".format(keyword, condition), '        ' + statement])
+            keyword = 'elif'
+        if branches:
+            lines.append('    else:')
+            lines.extend('        ' + line for line in body)
+        else:
+            lines.extend('    ' + line for line in body)
+        return lines
+
+    def type_steps(self, index:int, form_validator:FormValidator) -> list:
+        """the regex and type checks as ('check', condition, message) and ('set', expression) steps"""
+        if form_validator.result_cache is not None:
+            # the cache covers the regex and the checker, both run through check_type
+            check_type = self.__constant(index, 'check_type', form_validator.check_type)
+            return [('set', """{}(value)""".format(check_type))] + self.__invalid_steps()
+
+        steps = []
+        if form_validator.regex_match is not None:
+            regex_match = self.__constant(index, 'regex_match', form_validator.regex_match)
+            message = """Value does not match the pattern {}""".format(form_validator.field._regex)
+            steps.append(('check', """not {}(value)""".format(regex_match), repr(message)))
+
+        field_type = form_validator.field._get_field_type(form_validator.field)
+        builder = getattr(self, field_type, None)
+        if callable(builder):
+            steps.extend(builder(index, form_validator))
+        elif form_validator.checker is not None:
+            checker = self.__constant(index, 'checker', form_validator.checker)
+            steps.append(('set', """{}(value)""".format(checker)))
+            steps.extend(self.__invalid_steps())
+        return steps
+
+    def __constant(self, index:int, name:str, value) -> str:
+        """source for value, put into the namespace of the function unless it is a plain literal"""
+        if value is None or value.__class__ in (bool, int, str):
+            return repr(value)
+        name = """{}_{}""".format(name, index)
+        self.namespace[name] = value
+        return name
+
+    @staticmethod
+    def __render_steps(steps:list, name:str) -> list:
+        lines = []
+        indent = ''
+        for step in steps:
+            if step[0] == 'set':
+                lines.append("""{}value = {}""".format(indent, step[1]))
+            else:
+                lines.extend(["""{}if {}:""".format(indent, step[1]),
+                              """{}    errors[{}] = {}""".format(indent, name, step[2]),
+                              """{}else:""".format(indent)])
+                indent += '    '
+        lines.append("""{}clean[{}] = value""".format(indent, name))
+        return lines
+
+    @staticmethod
+    def __invalid_steps() -> list:
+        return [('check', 'value.__class__ is Invalid', 'value.message')]
+
+    def __length_steps(self, index:int, form_validator:FormValidator) -> list:
+        steps = []
+        if form_validator.max_length is not None:
+            steps.append(('check', """len(value) > {}""".format(
+                self.__constant(index, 'max_length', form_validator.max_length)),
+                repr("""Length cannot be more than {}""".format(form_validator.max_length))))
+        if form_validator.min_length is not None:
+            steps.append(('check', """len(value) < {}""".format(
+                self.__constant(index, 'min_length', form_validator.min_length)),
+                repr("""Length cannot be less than {}""".format(form_validator.min_length))))
+        return steps
+
+    def __range_steps(self, index:int, form_validator:FormValidator) -> list:
+        steps = []
+        if form_validator.max_value is not None:
+            steps.append(('check', """value > {}""".format(
+                self.__constant(index, 'max_value', form_validator.max_value)),
+                repr("""Value cannot be more than {}""".format(form_validator.max_value))))
+        if form_validator.min_value is not None:
+            steps.append(('check', """value < {}""".format(
+                self.__constant(index, 'min_value', form_validator.min_value)),
+                repr("""Value cannot be less than {}""".format(form_validator.min_value))))
+        return steps
+
+    def CharField(self, index:int, form_validator:FormValidator) -> list:
+        return self.__length_steps(index, form_validator) + [('set', 'str(value)')]
+
+    def TextField(self, index:int, form_validator:FormValidator) -> list:
+        return self.__length_steps(index, form_validator) + [('set', 'str(value)')]
+
+    def SlugField(self, index:int, form_validator:FormValidator) -> list:
+        return self.__length_steps(index, form_validator) + [('set', 'slugify(str(value))')]
+
+    def IntegerField(self, index:int, form_validator:FormValidator) -> list:
+        # isdecimal holds for exactly the digit strings int() parses
+        return [('set', 'str(value)'), ('check', 'not value.isdecimal()', repr('Invalid integer')),
+                ('set', 'int(value)')] + self.__range_steps(index, form_validator)
+
+    def RangeField(self, index:int, form_validator:FormValidator) -> list:
+        return self.__range_steps(index, form_validator)
+
+    def PasswordField(self, index:int, form_validator:FormValidator) -> list:
+        field = form_validator.field
+        steps = [('set', 'str(value)')] + self.__length_steps(index, form_validator)
+        if getattr(field, '_must_contain_number', None):
+            steps.append(('check', 'not any(char.isdigit() for char in value)',
+                          repr('Password must contain a numeric character')))
+        if getattr(field, '_must_contain_symbol', None):
+            steps.append(('check', 'all(char.isalnum() for char in value)', repr('Password must contain a symbol')))
+        if getattr(field, '_must_contain_upper_case', None):
+            steps.append(('check', 'not any(char.isupper() for char in value)',
+                          repr('Password must contain an upper case character')))
+        if getattr(field, '_must_contain_lower_case', None):
+            steps.append(('check', 'not any(char.islower() for char in value)',
+                          repr('Password must contain a lower case character')))
+        return steps
+
+    @staticmethod
+    def ColorField(index:int, form_validator:FormValidator) -> list:
+        return [('check', 'not color_match(value)', repr('Invalid hex color')), ('set', 'str(value)')]
+
+    @staticmethod
+    def EmailField(index:int, form_validator:FormValidator) -> list:
+        return [('set', 'str(value)'),
+                ('check', 'not email_match(value) or parseaddr(value)[1] != value', repr('Invalid email'))]
+
+    @staticmethod
+    def UuidField(index:int, form_validator:FormValidator) -> list:
+        return [('set', 'str(value)'), ('check', 'not uuid_match(value)', repr('Invalid uuid'))]
+
+    @staticmethod
+    def PhoneField(index:int, form_validator:FormValidator) -> list:
+        steps = [('set', 'str(value)'), ('check', 'not phone_match(value)', repr('Invalid Phone'))]
+        if getattr(form_validator.field, '_internationalize', None):
+            steps.append(("check", "value[:1] != '+' and value[:2] != '00'",
+                          repr('Phone must be in international format')))
+        return steps
+
+    @staticmethod
+    def HiddenField(index:int, form_validator:FormValidator) -> list:
+        return []
+
+    @staticmethod
+    def FileField(index:int, form_validator:FormValidator) -> list:
+        return []
+
+    @staticmethod
+    def ImageField(index:int, form_validator:FormValidator) -> list:
+        return []
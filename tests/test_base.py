@@ -1,6 +1,16 @@
+import asyncio
+import json
+import os
+import sqlite3
+import tempfile
+import time
 import unittest
+from datetime import datetime
 
-from casper import forms
+from casper import BoundField, forms, instrumentation, json_export
+from casper.column_validator import ColumnValidator
+from casper.exceptions.exceptions import FieldCreateFailedException, ValidationFailedException
+from casper.widgets.widgets import Validator
 
 
 class TestForms(unittest.TestCase):
@@ -34,3 +44,635 @@ class TestContactForm(TestForms):
         cleaned_data = contact_form.clean_data()
         self.assertEqual(initial_data['id'], cleaned_data['id'])
         self.assertEqual({}, contact_form.errors())
+
+    def test_iter_html(self):
+        contact_form = ContactForm(initial={'email': 'someone@example.com'})
+        self.assertEqual(contact_form.as_html(), ''.join(contact_form.iter_html()))
+
+
+class SignupForm(forms.Form):
+    username = forms.CharField(max_length=10)
+    age = forms.IntegerField(min_value=18)
+
+    def validate_username(self):
+        return self.clean_data()['username'].lower()
+
+
+class TestSignupForm(TestForms):
+
+    def test_validation_plan(self):
+        self.assertEqual(['username', 'age'], [name for name, field, hook in SignupForm.validation_plan])
+        self.assertIsNotNone(SignupForm.validation_plan[0][2])
+        self.assertIsNone(SignupForm.validation_plan[1][2])
+
+    def test_signup_with_initial(self):
+        signup_form = SignupForm(initial={'username': 'Casper', 'age': 12})
+        self.assertFalse(signup_form.is_valid())
+        self.assertEqual('Value cannot be less than 18', signup_form.errors()['age'])
+
+    def test_forms_do_not_share_state(self):
+        invalid_form = SignupForm(initial={'username': 'Casper', 'age': 12})
+        valid_form = SignupForm(initial={'username': 'Ada', 'age': 30})
+        self.assertTrue(valid_form.is_valid())
+        self.assertFalse(invalid_form.is_valid())
+        self.assertEqual({}, valid_form.errors())
+        self.assertEqual({'username': 'ada', 'age': 30}, valid_form.clean_data())
+        self.assertIsNone(SignupForm.declared_fields['age']._default)
+
+    def test_validate_many(self):
+        rows = [{'username': 'Ada', 'age': 30}, {'username': 'Casper', 'age': 12}, {'age': 40}]
+        results = list(SignupForm.validate_many(iter(rows)))
+        self.assertEqual(({'username': 'ada', 'age': 30}, {}), results[0])
+        self.assertEqual(({}, {'age': 'Value cannot be less than 18'}), results[1])
+        self.assertEqual('This field is required', results[2][1]['username'])
+
+    @unittest.skipUnless(ColumnValidator.is_available(), 'numpy is not installed')
+    def test_validate_many_columns(self):
+        rows = [{'quantity': value, 'code': value} for value in ['12', 7, '-3', 'abc', '', 500, '0042', 'toolong']]
+        self.assertEqual(list(ImportForm.validate_many(rows)),
+                         list(ImportForm.validate_many(rows, columns=True, chunk_size=3)))
+
+    def test_validate_parallel(self):
+        rows = [{'quantity': value, 'code': 'ab'} for value in range(-50, 250)]
+        self.assertEqual(list(ImportForm.validate_many(rows)),
+                         list(ImportForm.validate_parallel(rows, workers=2, chunk_size=64, parallel_threshold=0)))
+
+    def test_data_is_validated_once(self):
+        counter = CountingValidator()
+
+        class CountedForm(forms.Form):
+            username = forms.CharField(validators=[counter])
+
+        counted_form = CountedForm(data={'username': 'Casper'})
+        self.assertEqual(0, counter.calls)
+        self.assertTrue(counted_form.is_valid())
+        self.assertEqual({'username': 'Casper'}, counted_form.clean_data())
+        self.assertEqual({}, counted_form.errors())
+        self.assertEqual(1, counter.calls)
+
+    def test_as_html_keeps_none_in_values(self):
+        signup_form = SignupForm(initial={'username': 'Nonesuch'})
+        html = signup_form.as_html()
+        self.assertIn("value='Nonesuch'", html)
+        self.assertNotIn("class='None'", html)
+
+
+class TestRenderCache(TestForms):
+
+    def test_unbound_form_is_rendered_once(self):
+        class CachedContactForm(forms.Form):
+            email = forms.EmailField()
+            message = forms.TextField(required=False)
+
+            class Meta:
+                render_cache = 16
+
+        html = CachedContactForm().as_html()
+        self.assertEqual(html, CachedContactForm().as_html())
+        self.assertEqual(1, CachedContactForm.render_cache.hits)
+
+        bound_html = CachedContactForm(initial={'email': 'someone@example.com'}).as_html()
+        self.assertIn("value='someone@example.com'", bound_html)
+        self.assertEqual(html, CachedContactForm().as_html())
+
+        CachedContactForm.declared_fields['message'].help_text = 'say hello'
+        self.assertIn('say hello', CachedContactForm().as_html())
+
+        CachedContactForm.invalidate_render_cache()
+        self.assertEqual(0, len(CachedContactForm.render_cache))
+
+
+class TestInputTypes(TestForms):
+
+    def test_input_types(self):
+        class DeviceForm(forms.Form):
+            pin = forms.PasswordField()
+            phone = forms.PhoneField(required=False)
+            seen = forms.DateTimeField(required=False)
+            alarm = forms.TimeField(required=False, help_text="type='date'")
+
+        html = DeviceForm(initial={'pin': "type='text'"}).as_html()
+        for input_type in ('password', 'tel', 'datetime-local', 'time'):
+            self.assertIn("""type='{}'""".format(input_type), html)
+        # only the input type is set, matching text in values and help text is left alone
+        self.assertIn("""value='type='text''""", html)
+        self.assertIn("""type='date'<br>""", html)
+
+
+class CountingValidator(Validator):
+    calls = 0
+
+    def run(self, data):
+        self.calls += 1
+        return data
+
+
+class ImportForm(forms.Form):
+    quantity = forms.IntegerField(min_value=1, max_value=100)
+    code = forms.CharField(min_length=2, max_length=4, required=False)
+
+
+class TestChoiceSource(TestForms):
+
+    def test_choices_are_loaded_on_first_use(self):
+        loads = []
+
+        def colours():
+            loads.append(1)
+            return ['red', 'green']
+
+        class ColourForm(forms.Form):
+            colour = forms.ChoiceField(choices=colours, choices_ttl=60)
+
+        self.assertEqual([], loads)
+        self.assertTrue(ColourForm(data={'colour': 'red'}).is_valid())
+        self.assertFalse(ColourForm(data={'colour': 'blue'}).is_valid())
+        self.assertIn("value='green'", ColourForm().as_html())
+        self.assertEqual([1], loads)
+
+    def test_choices_past_max_size_are_not_dropped(self):
+        field = forms.ChoiceField(choices=lambda: ['a', 'b', 'c'], choices_max_size=2)
+        with self.assertRaisesRegex(ValidationFailedException, 'more than choices_max_size=2'):
+            field.validate('c')
+        with self.assertRaises(FieldCreateFailedException):
+            field.as_html()
+
+        field = forms.ChoiceField(choices=lambda: ['a', 'b', 'c'], choices_max_size=3)
+        self.assertEqual('c', field.validate('c'))
+
+    def test_render_cache_follows_refreshed_choices(self):
+        colours = ['red', 'green']
+
+        class CachedColourForm(forms.Form):
+            colour = forms.ChoiceField(choices=lambda: list(colours), choices_ttl=0.05)
+
+            class Meta:
+                render_cache = 16
+
+        self.assertNotIn("value='blue'", CachedColourForm().as_html())
+        colours.append('blue')
+        deadline = time.monotonic() + 5
+        # the refresh runs in the background once the ttl has passed, renders keep the old choices until then
+        while "value='blue'" not in CachedColourForm().as_html() and time.monotonic() < deadline:
+            time.sleep(0.01)
+        self.assertIn("value='blue'", CachedColourForm().as_html())
+
+
+class SkuForm(forms.Form):
+    sku = forms.DataListField(choices=forms.InMemoryChoiceSource(['A-1', 'B-2', 'C-3']))
+
+
+class TestRemoteChoiceSource(TestForms):
+
+    def test_remote_choices_are_looked_up_once(self):
+        source = SkuForm.declared_fields['sku']._remote_choices
+        self.assertTrue(SkuForm(data={'sku': 'A-1,B-2'}).is_valid())
+        self.assertEqual({'sku': 'D-4 is not a valid option for this field'}, SkuForm(data={'sku': 'D-4'}).errors())
+        self.assertTrue(SkuForm(data={'sku': 'B-2'}).is_valid())
+        self.assertEqual(2, source.lookups)
+
+    def test_validate_many_batches_lookups(self):
+        source = forms.InMemoryChoiceSource(['A-1', 'B-2', 'C-3'])
+
+        class BatchSkuForm(forms.Form):
+            sku = forms.ChoiceField(choices=source)
+
+        rows = [{'sku': 'C-3'}, {'sku': 'E-5'}, {'sku': 'C-3'}, {'sku': 'E-5'}]
+        results = list(BatchSkuForm.validate_many(rows))
+        self.assertEqual([{}, {'sku': 'E-5 is not a valid option for this field'}] * 2,
+                         [errors for clean_data, errors in results])
+        self.assertEqual(1, source.lookups)
+
+    def test_sqlite_choice_source(self):
+        with tempfile.TemporaryDirectory() as directory:
+            database = os.path.join(directory, 'skus.db')
+            connection = sqlite3.connect(database)
+            connection.execute('CREATE TABLE product (sku TEXT)')
+            connection.executemany('INSERT INTO product VALUES (?)', [('A-1',), ('B-2',)])
+            connection.commit()
+            connection.close()
+
+            source = forms.SqliteChoiceSource(database, 'product', 'sku')
+            self.assertEqual({'A-1'}, source.contains(['A-1', 'Z-9']))
+            source.close()
+
+
+class UniqueUsernameValidator(Validator):
+    taken = ('admin',)
+
+    async def run(self, data):
+        await asyncio.sleep(0)
+        if data in self.taken:
+            raise ValidationFailedException('Username is taken')
+        return data
+
+
+class AsyncSignupForm(forms.Form):
+    username = forms.CharField(max_length=10, validators=[UniqueUsernameValidator()])
+    email = forms.EmailField()
+
+    async def validate_email(self):
+        await asyncio.sleep(0)
+        return self.clean_data()['email'].lower()
+
+    class Meta:
+        async_concurrency = 1
+
+
+class TestAsyncValidation(TestForms):
+
+    def test_ais_valid(self):
+        form = AsyncSignupForm(data={'username': 'ada', 'email': 'Ada@Example.com'})
+        self.assertTrue(asyncio.run(form.ais_valid()))
+        self.assertEqual({'username': 'ada', 'email': 'ada@example.com'}, form.clean_data())
+
+        form = AsyncSignupForm(data={'username': 'admin', 'email': 'ada@example.com'})
+        self.assertFalse(asyncio.run(form.ais_valid()))
+        self.assertEqual({'username': 'Username is taken'}, form.errors())
+
+    def test_async_validator_timeout(self):
+        class SlowValidator(Validator):
+            async def run(self, data):
+                await asyncio.sleep(1)
+                return data
+
+        class SlowForm(forms.Form):
+            name = forms.CharField(validators=[SlowValidator()])
+
+        form = SlowForm(data={'name': 'ada'})
+        self.assertFalse(asyncio.run(form.ais_valid(timeout=0.01)))
+        self.assertEqual({'name': 'Validation timed out'}, form.errors())
+
+
+class TestFailFast(TestForms):
+
+    def test_fail_fast_stops_at_first_error(self):
+        class FailFastForm(forms.Form):
+            name = forms.CharField(max_length=5)
+            born = forms.DateField()
+            age = forms.IntegerField()
+
+            class Meta:
+                fail_fast = True
+
+        form = FailFastForm(data={'name': 'a', 'born': 'soon', 'age': 'old'})
+        self.assertEqual({'born': 'Invalid datetime object'}, form.errors())
+
+    def test_cost_ordered_runs_cheap_checks_first(self):
+        counting_validator = CountingValidator()
+
+        class CostOrderedForm(forms.Form):
+            born = forms.DateField(validators=[counting_validator])
+            name = forms.CharField(max_length=5)
+
+            class Meta:
+                fail_fast = True
+                cost_ordered = True
+
+        self.assertEqual(('name', 'born'), tuple(step[0] for step in CostOrderedForm.cost_ordered_plan))
+        form = CostOrderedForm(data={'born': '2020-01-01', 'name': 'too long'})
+        self.assertEqual({'name': 'Length cannot be more than 5'}, form.errors())
+        self.assertEqual(0, counting_validator.calls)
+
+        form = CostOrderedForm(data={'born': '2020-01-01', 'name': 'ada'})
+        self.assertTrue(form.is_valid())
+        self.assertEqual(['born', 'name'], list(form.clean_data()))
+        self.assertEqual(1, counting_validator.calls)
+
+
+class TestValidationErrors(TestForms):
+
+    def test_public_api_still_raises(self):
+        field = forms.IntegerField(max_value=10)
+        with self.assertRaises(ValidationFailedException) as context:
+            field.validate('x1')
+        self.assertEqual('Invalid integer', str(context.exception))
+        with self.assertRaises(ValidationFailedException) as context:
+            forms.BooleanField().validate('maybe')
+        self.assertEqual('Invalid Boolean', str(context.exception))
+        self.assertEqual(7, field.validate('7'))
+
+    def test_definition_changes_are_validated(self):
+        class RenamedForm(forms.Form):
+            name = forms.CharField(max_length=10)
+            joined = forms.DateField(required=False, max_value='2030-01-01')
+
+        RenamedForm.declared_fields['name']._max_length = 3
+        RenamedForm.declared_fields['joined']._max_value = '2010-01-01'
+        form = RenamedForm(data={'name': 'abcdef', 'joined': '2020-01-01'})
+        self.assertFalse(form.is_valid())
+        self.assertEqual({'name': 'Length cannot be more than 3',
+                          'joined': 'Date value cannot be more than 2010-01-01 00:00:00'}, form.errors())
+
+        RenamedForm.declared_fields['name']._regex = '[0-9]+'
+        form = RenamedForm(data={'name': 'abc'})
+        self.assertFalse(form.is_valid())
+        self.assertEqual('Value does not match the pattern [0-9]+', form.errors()['name'])
+
+
+class TestValidationCache(TestForms):
+
+    def test_repeated_values_are_checked_once(self):
+        class NewsletterForm(forms.Form):
+            email = forms.EmailField(result_cache_size=2)
+            signed_up = forms.DateTimeField(result_cache_size=2, validators=[CountingValidator()])
+
+        rows = [{'email': 'ada@example.com', 'signed_up': '2020-01-01 10:00'},
+                {'email': 'bad@', 'signed_up': '2020-01-01 10:00'}] * 3
+        results = list(NewsletterForm.validate_many(rows))
+        self.assertEqual({'email': 'Invalid email'}, results[-1][1])
+        self.assertEqual({'hits': 4, 'misses': 2, 'size': 2, 'max_size': 2},
+                         NewsletterForm.declared_fields['email'].validation_cache_info())
+        self.assertIsNone(NewsletterForm.declared_fields['signed_up'].validation_cache_info())
+
+    def test_standalone_validation_keeps_the_version(self):
+        field = forms.EmailField(result_cache_size=8)
+        version = field._version
+        for _ in range(3):
+            self.assertEqual('ada@example.com', field.validate('ada@example.com'))
+        self.assertEqual(version, field._version)
+        self.assertEqual({'hits': 2, 'misses': 1, 'size': 1, 'max_size': 8}, field.validation_cache_info())
+
+
+
+class TestFieldSlots(TestForms):
+
+    def test_fields_have_no_instance_dict(self):
+        for field in (forms.CharField(), forms.DateField(), forms.ChoiceField(choices=['a']),
+                      forms.SubmitButtonField(), forms.ImageField()):
+            self.assertFalse(hasattr(field, '__dict__'), field)
+
+
+class TestInstrumentation(TestForms):
+
+    def test_aggregator_collects_field_and_render_timings(self):
+        class ProfiledForm(forms.Form):
+            username = forms.CharField(max_length=10, validators=[CountingValidator()])
+            age = forms.IntegerField(min_value=18)
+
+            def validate_username(self):
+                return self.clean_data()['username'].lower()
+
+        aggregator = instrumentation.TimingAggregator()
+        ProfiledForm.add_observer(aggregator)
+        form = ProfiledForm(data={'username': 'Ada', 'age': '12'})
+        self.assertFalse(form.is_valid())
+        form.as_html()
+
+        histograms = aggregator.histograms()
+        self.assertEqual({('ProfiledForm', 'username', 'general'), ('ProfiledForm', 'username', 'checker'),
+                          ('ProfiledForm', 'username', 'validators'), ('ProfiledForm', 'username', 'hook'),
+                          ('ProfiledForm', 'age', 'general'), ('ProfiledForm', 'age', 'checker'),
+                          ('ProfiledForm', 'as_html', 'render')}, set(histograms))
+        self.assertEqual(1, histograms[('ProfiledForm', 'as_html', 'render')]['count'])
+        self.assertIn('casper_form_seconds_count{form="ProfiledForm",target="age",step="checker"} 1',
+                      aggregator.to_prometheus())
+
+        ProfiledForm.remove_observer(aggregator)
+        ProfiledForm(data={'username': 'Ada', 'age': '20'}).is_valid()
+        self.assertEqual(1, aggregator.histograms()[('ProfiledForm', 'age', 'checker')]['count'])
+
+    def test_observers_are_inherited(self):
+        class ParentForm(forms.Form):
+            age = forms.IntegerField()
+
+        class ChildForm(ParentForm):
+            pass
+
+        child_aggregator = instrumentation.TimingAggregator()
+        parent_aggregator = instrumentation.TimingAggregator()
+        ChildForm.add_observer(child_aggregator)
+        ParentForm.add_observer(parent_aggregator)
+        self.assertTrue(ChildForm(data={'age': '20'}).is_valid())
+        self.assertEqual(1, parent_aggregator.histograms()[('ChildForm', 'age', 'checker')]['count'])
+        self.assertEqual(1, child_aggregator.histograms()[('ChildForm', 'age', 'checker')]['count'])
+
+        ParentForm.remove_observer(parent_aggregator)
+        self.assertEqual((child_aggregator,), ChildForm.observers)
+        self.assertEqual((), ParentForm.observers)
+
+
+class TestJsonExport(TestForms):
+
+    def test_as_json_bytes(self):
+        class CachedSignupForm(forms.Form):
+            username = forms.CharField(max_length=10)
+
+            class Meta:
+                render_cache = 16
+
+        body, etag = CachedSignupForm().as_json_bytes()
+        self.assertEqual(CachedSignupForm().as_json(), json.loads(body))
+        self.assertEqual((body, etag), CachedSignupForm().as_json_bytes())
+
+        form = CachedSignupForm(data={'username': 'a' * 20})
+        self.assertFalse(form.is_valid())
+        bound_body, bound_etag = form.as_json_bytes()
+        self.assertNotEqual(etag, bound_etag)
+        self.assertEqual('Length cannot be more than 10', json.loads(bound_body)[0]['error'])
+
+        CachedSignupForm.declared_fields['username'].help_text = 'pick one'
+        self.assertNotEqual(etag, CachedSignupForm().as_json_bytes()[1])
+
+    def test_json_bytes_match_without_orjson(self):
+        data = [{'default': 2 ** 70, 'data': datetime(2020, 1, 1), 'choices': [{'a': 1}]}]
+        body = json_export.to_json_bytes(data)
+        orjson, json_export.orjson = json_export.orjson, None
+        try:
+            self.assertEqual(json_export.to_json_bytes(data), body)
+        finally:
+            json_export.orjson = orjson
+        self.assertEqual(b'[{"default":1180591620717411303424,"data":"2020-01-01 00:00:00","choices":[{"a":1}]}]', body)
+
+    def test_as_json_returns_copies(self):
+        class ColourForm(forms.Form):
+            colour = forms.ChoiceField(choices=['red', {'Green': ['g', 'G']}])
+
+        ColourForm().as_json()[0]['choices'].append({'blue': 'blue'})
+        ColourForm().as_json()[0]['choices'][1]['Green'].append('x')
+        self.assertEqual([{'red': 'red'}, {'Green': ['g', 'G']}], ColourForm().as_json()[0]['choices'])
+
+
+class TestJsonSchema(TestForms):
+
+    def test_json_schema(self):
+        class ProfileForm(forms.Form):
+            username = forms.CharField(max_length=10, regex='[a-z]+')
+            age = forms.IntegerField(min_value=18, required=False)
+            colour = forms.ChoiceField(choices=['red', 'green'], required=False, allow_null=True)
+
+        schema = ProfileForm.json_schema()
+        self.assertEqual(['username'], schema['required'])
+        # any value is read through str(), the string keywords only constrain strings
+        self.assertEqual({'maxLength': 10, 'minLength': 1, 'minItems': 1, 'pattern': '^(?:[a-z]+)'},
+                         schema['properties']['username'])
+        self.assertEqual({'anyOf': [{'type': ['integer', 'string'], 'minimum': 18},
+                                    {'enum': [None, False, 0, '', [], {}]}]},
+                         schema['properties']['age'])
+        # a list or a comma separated string, the falsy values become null
+        self.assertEqual({'type': ['array', 'string'], 'items': {'enum': ['red', 'green']}},
+                         schema['properties']['colour']['anyOf'][0])
+        self.assertIs(schema, ProfileForm.json_schema())
+
+        ProfileForm.declared_fields['username'].help_text = 'pick one'
+        self.assertEqual('pick one', ProfileForm.json_schema()['properties']['username']['description'])
+
+    def test_patterns_allow_a_trailing_newline(self):
+        class AlarmForm(forms.Form):
+            colour = forms.ColorField()
+            alarm = forms.TimeField()
+
+        # the form takes '#fff\n' and '12:00\n', an ecma-262 $ needs the newline spelled out
+        self.assertTrue(AlarmForm(data={'colour': '#fff\n', 'alarm': '12:00\n'}).is_valid())
+        properties = AlarmForm.json_schema()['properties']
+        self.assertTrue(properties['colour']['pattern'].endswith(r'\n?$'))
+        self.assertTrue(properties['alarm']['pattern'].endswith(r'\n?$'))
+        # dateutil reads numbers as times too
+        self.assertNotIn('type', properties['alarm'])
+
+
+class TestCompiledValidator(TestForms):
+
+    def test_compiled_validator(self):
+        class CompiledSignupForm(forms.Form):
+            username = forms.CharField(max_length=10, min_length=2)
+            age = forms.IntegerField(min_value=18, required=False)
+            colour = forms.ChoiceField(choices=['red', 'green'], required=False)
+            joined = forms.DateField(required=False)
+
+            class Meta:
+                compiled = True
+
+        validate = CompiledSignupForm.compiled_validator()
+        self.assertIs(validate, CompiledSignupForm.compiled_validator())
+        self.assertEqual(({'username': 'ada', 'age': 20, 'colour': "['red']", 'joined': None}, {}),
+                         validate({'username': 'ada', 'age': '20', 'colour': 'red'}))
+        self.assertEqual(({}, {'username': 'Length cannot be more than 10', 'age': 'Invalid integer',
+                               'colour': 'blue is not a valid option for this field'}),
+                         validate({'username': 'a' * 20, 'age': '2x', 'colour': 'blue'}))
+
+        form = CompiledSignupForm(data={'username': 'a', 'age': '12'})
+        self.assertFalse(form.is_valid())
+        self.assertEqual({'username': 'Length cannot be less than 2', 'age': 'Value cannot be less than 18'},
+                         form.errors())
+        self.assertEqual('Value cannot be less than 18', form.as_json()[1]['error'])
+
+        CompiledSignupForm.declared_fields['username']._required = False
+        self.assertIsNot(validate, CompiledSignupForm.compiled_validator())
+
+    def test_definition_changes_are_compiled(self):
+        class CompiledBoundsForm(forms.Form):
+            name = forms.CharField(max_length=10)
+            age = forms.IntegerField(max_value=99)
+
+        validate = CompiledBoundsForm.compiled_validator()
+        self.assertEqual({}, validate({'name': 'abcdef', 'age': '50'})[1])
+
+        CompiledBoundsForm.declared_fields['name']._max_length = 3
+        CompiledBoundsForm.declared_fields['age']._max_value = 40
+        self.assertEqual({'name': 'Length cannot be more than 3', 'age': 'Value cannot be more than 40'},
+                         CompiledBoundsForm.compiled_validator()({'name': 'abcdef', 'age': '50'})[1])
+
+    def test_hooks_are_not_compiled(self):
+        self.assertIsNone(AsyncSignupForm.compiled_validator())
+
+
+class TestFieldFormDefaults(TestForms):
+
+    def test_form_defaults(self):
+        field = forms.CharField(place_holder='Your name', required=False)
+        field._set_field_name('username')
+        self.assertEqual("placeholder='Your name' id='id_username' name='username' ",
+                         field._get_field_form_defaults())
+
+        bound_field = BoundField(field)
+        bound_field._set_data('Ada')
+        self.assertEqual("placeholder='Your name' id='id_username' value='Ada' name='username' ",
+                         field._get_field_form_defaults(bound_field))
+
+        field._regex = '[A-Z][a-z]+'
+        self.assertEqual("pattern='[A-Z][a-z]+' placeholder='Your name' id='id_username' name='username' ",
+                         field._get_field_form_defaults())
+
+
+class TestDateFormats(TestForms):
+
+    def test_formats_are_tried_first(self):
+        field = forms.DateField(formats=['%d/%m/%Y'])
+        self.assertEqual(datetime(2020, 5, 12), field.validate('12/05/2020'))
+        self.assertEqual(datetime(2020, 5, 12), field.validate('2020-05-12'))
+
+    def test_bounds_are_parsed_when_created(self):
+        field = forms.DateField(max_value='01/01/2030', min_value='01/01/2000', formats=['%d/%m/%Y'])
+        form_validator = field._get_form_validator()
+        self.assertEqual((datetime(2030, 1, 1), datetime(2000, 1, 1)),
+                         (form_validator.max_value, form_validator.min_value))
+        with self.assertRaises(ValidationFailedException) as context:
+            field.validate('12/05/2040')
+        self.assertEqual('Date value cannot be more than 2030-01-01 00:00:00', str(context.exception))
+
+    def test_time_formats_are_dated_today(self):
+        self.assertEqual(forms.TimeField().validate('12:30'), forms.TimeField(formats=['%H:%M']).validate('12:30'))
+        self.assertEqual(forms.TimeField().validate('12:30'), forms.TimeField(formats=['%H.%M']).validate('12.30'))
+
+    def test_unparseable_bound(self):
+        with self.assertRaises(FieldCreateFailedException):
+            forms.DateField(max_value='not a date')
+
+
+class TestFormValidatorHelpers(TestForms):
+
+    def test_public_helpers_raise(self):
+        validator = forms.FormValidator
+        with self.assertRaisesRegex(ValidationFailedException, 'Length cannot be more than 2'):
+            validator.check_max_length('abc', 2)
+        with self.assertRaisesRegex(ValidationFailedException, 'Value cannot be less than 5'):
+            validator.check_min_value(3, 5)
+        with self.assertRaisesRegex(ValidationFailedException, 'blue is not a valid option'):
+            validator.validate_choice_field(['blue'], [{'Red': 'red'}])
+        with self.assertRaisesRegex(ValidationFailedException, 'Invalid datetime object'):
+            validator.parse_to_time('not a date')
+        self.assertEqual("['red']", validator.validate_choice_field(['red'], [{'Red': 'red'}]))
+        self.assertEqual(datetime(2020, 5, 12), validator.parse_to_time('12/05/2020', ('%d/%m/%Y',)))
+
+
+class TestFieldRegex(TestForms):
+
+    def test_invalid_regex(self):
+        with self.assertRaises(FieldCreateFailedException):
+            forms.CharField(regex='[a-z')
+
+    def test_full_match(self):
+        prefix = forms.CharField(regex='[a-z]+')
+        full = forms.CharField(regex='[a-z]+', full_match=True)
+        self.assertEqual('abc123', prefix.validate('abc123'))
+        with self.assertRaises(ValidationFailedException) as context:
+            full.validate('abc123')
+        self.assertEqual('Value does not match the pattern [a-z]+', str(context.exception))
+        self.assertEqual('abc', full.validate('abc'))
+        with self.assertRaises(ValidationFailedException):
+            prefix.validate('123abc')
+
+
+class TestChoiceTable(TestForms):
+
+    def test_unhashable_choice_values(self):
+        field = forms.ChoiceField(choices=[{'One': [1]}, 'two'])
+        self.assertEqual(([1], 'two'), field._get_choice_table().index)
+        self.assertEqual(str([[1]]), field.validate([[1]]))
+        self.assertEqual(str(['two']), field.validate(['two']))
+        with self.assertRaises(ValidationFailedException) as context:
+            field.validate(['three'])
+        self.assertEqual('three is not a valid option for this field', str(context.exception))
+
+    def test_selected_options_render(self):
+        class PreferencesForm(forms.Form):
+            colour = forms.ChoiceField(choices=['red', 'green'])
+            tags = forms.CheckBoxField(choices=['a', 'b', 'c'], required=False)
+
+        form = PreferencesForm(data={'colour': 'green', 'tags': 'a,c'})
+        html = form.as_html()
+        self.assertIn("<option value='red' >Red</option><option value='green' selected='true' >Green</option>", html)
+        self.assertIn("value='a' name='tags' checked='true' >", html)
+        self.assertIn("value='b' name='tags' <label", html)
+        self.assertIn("value='c' name='tags' checked='true' >", html)